@@ -6,9 +6,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
+from matplotlib.colors import to_hex
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
 import time
 
 # Import demo modules
@@ -38,11 +38,26 @@ class OdometryGUIDemo:
         # Initialize demo instances
         self.demo_instances = {}
         
+        # Changes are collected per canvas and flushed at most once per frame (~60 Hz)
+        self.redraw_interval_ms = 16
+        self._dirty = {}  # Canvas key -> update function (or None) to run before redrawing
+        self._flush_id = None
+        
+        # Slider state: pose x, y, θ (deg) and 3D x, y, z, kept in sync by variable traces
+        self._state = np.zeros(6)
+        self._state_vars = [tk.DoubleVar(self.root) for _ in range(6)]
+        for index, var in enumerate(self._state_vars):
+            var.trace_add('write', lambda *args, index=index: self.sync_state(index))
+        
         # Setup status bar first
         self.setup_status_bar()
         
-        # Create tabs
+        # Create tabs; each one is rendered the first time it is shown. Slider initial values are
+        # passed at construction (ttk.Scale.set would fire their command), and mark_dirty ignores
+        # tabs that have not been shown yet
+        self._initialized_tabs = set()  # Canvas keys of tabs that have been rendered
         self.create_tabs()
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
         # Setup menu
         self.setup_menu()
@@ -73,6 +88,22 @@ class OdometryGUIDemo:
         # Tab 4: Wheel Odometry Demo
         self.create_wheel_odometry_tab()
         
+        # Redraw function for each canvas key
+        self.canvas_redraws = {
+            'pose': self.pose_visualizer.blit,
+            'rotation': self.rotation_demo.blit,
+            'pos3d': self.pos3d_canvas.draw_idle,
+            'odometry': self.odometry_demo.blit,
+        }
+        
+        # First-render (key, update function) pairs, in tab order
+        self.tab_initializers = [
+            ('pose', self.update_pose),
+            ('rotation', self.update_rotation),
+            ('pos3d', self.update_3d_position),
+            ('odometry', None),
+        ]
+        
     def create_pose_tab(self):
         """Create the pose visualization tab"""
         pose_frame = ttk.Frame(self.notebook)
@@ -101,12 +132,7 @@ class OdometryGUIDemo:
         
         # Create matplotlib figure
         self.pose_fig = Figure(figsize=(8, 5), dpi=100)  # Reduced figure size
-        self.pose_canvas = FigureCanvasTkAgg(self.pose_fig, plot_frame)
-        self.pose_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Create toolbar
-        pose_toolbar = NavigationToolbar2Tk(self.pose_canvas, plot_frame)
-        pose_toolbar.update()
+        self.pose_canvas = self.create_figure_canvas(self.pose_fig, plot_frame)
         
         # Create controls frame (bottom section)
         controls_frame = ttk.Frame(paned_window)
@@ -119,28 +145,43 @@ class OdometryGUIDemo:
         self.pose_visualizer = PoseVisualizer(self.pose_fig)
         self.demo_instances['pose'] = self.pose_visualizer
         
+    def create_figure_canvas(self, fig, parent):
+        """Create a Tk canvas and toolbar for fig inside parent"""
+        canvas = FigureCanvasTkAgg(fig, parent)
+        
+        # Pack the toolbar first so that shrinking the window squeezes the plot, not the toolbar
+        toolbar = NavigationToolbar2Tk(canvas, parent, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Agg renders offscreen and each frame is copied to the screen in one blit; match the
+        # widget background to the figure and drop the focus ring so Tk never paints a
+        # contrasting strip while a resize is waiting for the next draw
+        widget = canvas.get_tk_widget()
+        widget.configure(highlightthickness=0, borderwidth=0,
+                         background=to_hex(fig.get_facecolor()))
+        widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        return canvas
+        
     def create_pose_controls(self, parent):
         """Create controls for pose visualization"""
         # Create a more compact layout with better organization
         # X position slider
         ttk.Label(parent, text="X Position:").grid(row=0, column=0, padx=5, pady=3, sticky='w')
-        self.x_slider = ttk.Scale(parent, from_=-5, to=5, orient=tk.HORIZONTAL, 
-                                 command=self.update_pose)
-        self.x_slider.set(0)
+        self.x_slider = ttk.Scale(parent, from_=-5, to=5, orient=tk.HORIZONTAL, variable=self._state_vars[0], 
+                                 command=lambda value: self.mark_dirty('pose', self.update_pose))
         self.x_slider.grid(row=0, column=1, padx=5, pady=3, sticky='ew')
         
         # Y position slider
         ttk.Label(parent, text="Y Position:").grid(row=1, column=0, padx=5, pady=3, sticky='w')
-        self.y_slider = ttk.Scale(parent, from_=-5, to=5, orient=tk.HORIZONTAL, 
-                                 command=self.update_pose)
-        self.y_slider.set(0)
+        self.y_slider = ttk.Scale(parent, from_=-5, to=5, orient=tk.HORIZONTAL, variable=self._state_vars[1], 
+                                 command=lambda value: self.mark_dirty('pose', self.update_pose))
         self.y_slider.grid(row=1, column=1, padx=5, pady=3, sticky='ew')
         
         # Orientation slider
         ttk.Label(parent, text="Orientation (deg):").grid(row=2, column=0, padx=5, pady=3, sticky='w')
-        self.theta_slider = ttk.Scale(parent, from_=-180, to=180, orient=tk.HORIZONTAL, 
-                                     command=self.update_pose)
-        self.theta_slider.set(0)
+        self.theta_slider = ttk.Scale(parent, from_=-180, to=180, orient=tk.HORIZONTAL, variable=self._state_vars[2], 
+                                     command=lambda value: self.mark_dirty('pose', self.update_pose))
         self.theta_slider.grid(row=2, column=1, padx=5, pady=3, sticky='ew')
         
         # Configure grid weights
@@ -180,13 +221,8 @@ The 3D rotation is shown in the 3D plot."""
         paned_window.add(plot_frame, weight=3)  # Plot gets more space
         
         # Create matplotlib figure
-        self.rotation_fig = Figure(figsize=(10, 6), dpi=100)  # Reduced figure size
-        self.rotation_canvas = FigureCanvasTkAgg(self.rotation_fig, plot_frame)
-        self.rotation_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Create toolbar
-        rotation_toolbar = NavigationToolbar2Tk(self.rotation_canvas, plot_frame)
-        rotation_toolbar.update()
+        self.rotation_fig = Figure(figsize=(8, 6), dpi=100)  # Reduced figure size
+        self.rotation_canvas = self.create_figure_canvas(self.rotation_fig, plot_frame)
         
         # Create controls frame (bottom section)
         controls_frame = ttk.Frame(paned_window)
@@ -203,9 +239,8 @@ The 3D rotation is shown in the 3D plot."""
         """Create controls for rotation demo"""
         # Theta slider
         ttk.Label(parent, text="Rotation Angle (deg):").grid(row=0, column=0, padx=5, pady=3, sticky='w')
-        self.theta_rotation_slider = ttk.Scale(parent, from_=0, to=360, orient=tk.HORIZONTAL, 
-                                             command=self.update_rotation)
-        self.theta_rotation_slider.set(0)
+        self.theta_rotation_slider = ttk.Scale(parent, from_=0, to=360, orient=tk.HORIZONTAL, value=0,
+                                             command=lambda value: self.mark_dirty('rotation', self.update_rotation))
         self.theta_rotation_slider.grid(row=0, column=1, padx=5, pady=3, sticky='ew')
         
         # Animation controls in a separate row
@@ -248,12 +283,7 @@ The 3D rotation is shown in the 3D plot."""
         
         # Create matplotlib figure
         self.pos3d_fig = Figure(figsize=(8, 6), dpi=100)  # Reduced figure size
-        self.pos3d_canvas = FigureCanvasTkAgg(self.pos3d_fig, plot_frame)
-        self.pos3d_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Create toolbar
-        pos3d_toolbar = NavigationToolbar2Tk(self.pos3d_canvas, plot_frame)
-        pos3d_toolbar.update()
+        self.pos3d_canvas = self.create_figure_canvas(self.pos3d_fig, plot_frame)
         
         # Create controls frame (bottom section)
         controls_frame = ttk.Frame(paned_window)
@@ -270,23 +300,20 @@ The 3D rotation is shown in the 3D plot."""
         """Create controls for 3D position demo"""
         # X position slider
         ttk.Label(parent, text="X Position:").grid(row=0, column=0, padx=5, pady=5)
-        self.x3d_slider = ttk.Scale(parent, from_=-3, to=3, orient=tk.HORIZONTAL, 
-                                   command=self.update_3d_position)
-        self.x3d_slider.set(0)
+        self.x3d_slider = ttk.Scale(parent, from_=-3, to=3, orient=tk.HORIZONTAL, variable=self._state_vars[3], 
+                                   command=lambda value: self.mark_dirty('pos3d', self.update_3d_position))
         self.x3d_slider.grid(row=0, column=1, padx=5, pady=5, sticky='ew')
         
         # Y position slider
         ttk.Label(parent, text="Y Position:").grid(row=1, column=0, padx=5, pady=5)
-        self.y3d_slider = ttk.Scale(parent, from_=-3, to=3, orient=tk.HORIZONTAL, 
-                                   command=self.update_3d_position)
-        self.y3d_slider.set(0)
+        self.y3d_slider = ttk.Scale(parent, from_=-3, to=3, orient=tk.HORIZONTAL, variable=self._state_vars[4], 
+                                   command=lambda value: self.mark_dirty('pos3d', self.update_3d_position))
         self.y3d_slider.grid(row=1, column=1, padx=5, pady=5, sticky='ew')
         
         # Z position slider
         ttk.Label(parent, text="Z Position:").grid(row=2, column=0, padx=5, pady=5)
-        self.z3d_slider = ttk.Scale(parent, from_=-3, to=3, orient=tk.HORIZONTAL, 
-                                   command=self.update_3d_position)
-        self.z3d_slider.set(0)
+        self.z3d_slider = ttk.Scale(parent, from_=-3, to=3, orient=tk.HORIZONTAL, variable=self._state_vars[5], 
+                                   command=lambda value: self.mark_dirty('pos3d', self.update_3d_position))
         self.z3d_slider.grid(row=2, column=1, padx=5, pady=5, sticky='ew')
         
         # Configure grid weights
@@ -319,13 +346,8 @@ The 3D rotation is shown in the 3D plot."""
         paned_window.add(plot_frame, weight=3)  # Plot gets more space
         
         # Create matplotlib figure
-        self.odometry_fig = Figure(figsize=(10, 7), dpi=100)  # Reduced figure size
-        self.odometry_canvas = FigureCanvasTkAgg(self.odometry_fig, plot_frame)
-        self.odometry_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Create toolbar
-        odometry_toolbar = NavigationToolbar2Tk(self.odometry_canvas, plot_frame)
-        odometry_toolbar.update()
+        self.odometry_fig = Figure(figsize=(8, 6), dpi=100)  # Reduced figure size
+        self.odometry_canvas = self.create_figure_canvas(self.odometry_fig, plot_frame)
         
         # Create controls frame (bottom section)
         controls_frame = ttk.Frame(paned_window)
@@ -333,7 +355,6 @@ The 3D rotation is shown in the 3D plot."""
         
         # Initialize wheel odometry demo
         self.odometry_demo = WheelOdometryDemo(self.odometry_fig)
-        self.odometry_demo.set_plot_update_callback(self.update_odometry_plots)
         self.demo_instances['odometry'] = self.odometry_demo
         
         # Create odometry controls
@@ -349,6 +370,7 @@ The 3D rotation is shown in the 3D plot."""
         ttk.Button(button_frame, text="Pause", command=self.stop_odometry_simulation).pack(side=tk.LEFT, padx=1)
         ttk.Button(button_frame, text="Reset", command=self.reset_odometry_simulation).pack(side=tk.LEFT, padx=1)
         ttk.Button(button_frame, text="Step", command=self.step_odometry_simulation).pack(side=tk.LEFT, padx=1)
+        ttk.Button(button_frame, text="Run to End", command=self.run_odometry_to_end).pack(side=tk.LEFT, padx=1)
         
         # Landmarks toggle
         self.landmarks_var = tk.BooleanVar(value=True)
@@ -357,15 +379,13 @@ The 3D rotation is shown in the 3D plot."""
         
         # Parameter sliders
         ttk.Label(parent, text="Total Time (s):").grid(row=1, column=0, padx=5, pady=5)
-        self.total_time_slider = ttk.Scale(parent, from_=10, to=100, orient=tk.HORIZONTAL, 
-                                          command=self.update_odometry_params)
-        self.total_time_slider.set(50)
+        self.total_time_slider = ttk.Scale(parent, from_=10, to=100, orient=tk.HORIZONTAL, value=50,
+                                          command=lambda value: self.mark_dirty('odometry', self.update_odometry_params))
         self.total_time_slider.grid(row=1, column=1, columnspan=2, padx=5, pady=5, sticky='ew')
         
         ttk.Label(parent, text="Linear Noise:").grid(row=2, column=0, padx=5, pady=5)
-        self.linear_noise_slider = ttk.Scale(parent, from_=0, to=0.5, orient=tk.HORIZONTAL, 
-                                           command=self.update_odometry_params)
-        self.linear_noise_slider.set(0.1)
+        self.linear_noise_slider = ttk.Scale(parent, from_=0, to=0.5, orient=tk.HORIZONTAL, value=0.1,
+                                           command=lambda value: self.mark_dirty('odometry', self.update_odometry_params))
         self.linear_noise_slider.grid(row=2, column=1, columnspan=2, padx=5, pady=5, sticky='ew')
         
         # Configure grid weights
@@ -392,41 +412,66 @@ The 3D rotation is shown in the 3D plot."""
         self.status_bar = ttk.Label(self.root, text="Ready", relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
         
+    def on_tab_changed(self, event=None):
+        """Render the selected tab if it has not been shown before"""
+        key, update_fn = self.tab_initializers[self.notebook.index(self.notebook.select())]
+        if key in self._initialized_tabs:
+            return
+        self._initialized_tabs.add(key)
+        self.mark_dirty(key, update_fn)
+        
+    def sync_state(self, index):
+        """Copy a slider variable into the shared state array"""
+        self._state[index] = self._state_vars[index].get()
+        
+    def mark_dirty(self, key, update_fn=None):
+        """Mark a canvas as needing a redraw, optionally running update_fn first"""
+        # A tab that has never been shown is fully rendered by on_tab_changed on its first visit
+        if key not in self._initialized_tabs:
+            return
+        if update_fn is not None or key not in self._dirty:
+            self._dirty[key] = update_fn
+        if self._flush_id is None:
+            self._flush_id = self.root.after(self.redraw_interval_ms, self.flush_dirty)
+            
+    def flush_dirty(self):
+        """Apply all pending changes, redraw each affected canvas once and refresh the status bar"""
+        dirty, self._dirty = self._dirty, {}
+        self._flush_id = None
+        status = None
+        for key, update_fn in dirty.items():
+            if update_fn is not None:
+                status = update_fn()
+            self.canvas_redraws[key]()
+        if status is not None:
+            self.status_bar.config(text=status)
+        
     def update_pose(self, value=None):
-        """Update pose visualization"""
+        """Update pose visualization and return the status text"""
         try:
-            x = self.x_slider.get()
-            y = self.y_slider.get()
-            theta = np.radians(self.theta_slider.get())
-            
-            self.pose_visualizer.update_pose(x, y, theta)
-            self.pose_canvas.draw()
-            self.status_bar.config(text=f"Pose: x={x:.2f}, y={y:.2f}, θ={self.theta_slider.get():.1f}°")
+            x, y, theta_deg = self._state[:3]
+            self.pose_visualizer.update_pose(x, y, np.radians(theta_deg))
+            return f"Pose: x={x:.2f}, y={y:.2f}, θ={theta_deg:.1f}°"
         except Exception as e:
-            self.status_bar.config(text=f"Error: {str(e)}")
+            return f"Error: {str(e)}"
             
     def update_rotation(self, value=None):
-        """Update rotation demo"""
+        """Update rotation demo and return the status text"""
         try:
-            theta = np.radians(self.theta_rotation_slider.get())
-            self.rotation_demo.update_rotation(theta)
-            self.rotation_canvas.draw()
-            self.status_bar.config(text=f"Rotation angle: {self.theta_rotation_slider.get():.1f}°")
+            theta_deg = self.theta_rotation_slider.get()
+            self.rotation_demo.update_rotation(np.radians(theta_deg))
+            return f"Rotation angle: {theta_deg:.1f}°"
         except Exception as e:
-            self.status_bar.config(text=f"Error: {str(e)}")
+            return f"Error: {str(e)}"
             
     def update_3d_position(self, value=None):
-        """Update 3D position demo"""
+        """Update 3D position demo and return the status text"""
         try:
-            x = self.x3d_slider.get()
-            y = self.y3d_slider.get()
-            z = self.z3d_slider.get()
-            
+            x, y, z = self._state[3:]
             self.pos3d_demo.update_position(x, y, z)
-            self.pos3d_canvas.draw()
-            self.status_bar.config(text=f"3D Position: x={x:.2f}, y={y:.2f}, z={z:.2f}")
+            return f"3D Position: x={x:.2f}, y={y:.2f}, z={z:.2f}"
         except Exception as e:
-            self.status_bar.config(text=f"Error: {str(e)}")
+            return f"Error: {str(e)}"
             
     def start_rotation_animation(self):
         """Start rotation animation"""
@@ -442,32 +487,39 @@ The 3D rotation is shown in the 3D plot."""
         """Reset rotation demo"""
         self.rotation_demo.reset()
         self.theta_rotation_slider.set(0)
-        self.rotation_canvas.draw()
+        self.mark_dirty('rotation')
         self.status_bar.config(text="Rotation demo reset")
         
     def start_odometry_simulation(self):
         """Start wheel odometry simulation"""
         self.odometry_demo.start_simulation()
-        self.odometry_canvas.draw()
+        self.mark_dirty('odometry')
         self.status_bar.config(text="Odometry simulation started")
         
     def stop_odometry_simulation(self):
         """Stop wheel odometry simulation"""
         self.odometry_demo.stop_simulation()
+        self.mark_dirty('odometry')
         self.status_bar.config(text="Odometry simulation stopped")
         
     def reset_odometry_simulation(self):
         """Reset wheel odometry simulation"""
         self.odometry_demo.reset_simulation()
-        self.odometry_canvas.draw()
+        self.mark_dirty('odometry')
         self.status_bar.config(text="Odometry simulation reset")
         
     def step_odometry_simulation(self):
         """Step wheel odometry simulation"""
         self.odometry_demo.step_simulation()
-        self.odometry_canvas.draw()
+        self.mark_dirty('odometry')
         self.status_bar.config(text="Odometry simulation stepped")
         
+    def run_odometry_to_end(self):
+        """Run wheel odometry simulation to the end"""
+        self.odometry_demo.run_to_end()
+        self.mark_dirty('odometry')
+        self.status_bar.config(text="Odometry simulation finished")
+        
     def toggle_landmarks(self):
         """Toggle landmark usage in odometry"""
         use_landmarks = self.landmarks_var.get()
@@ -475,24 +527,15 @@ The 3D rotation is shown in the 3D plot."""
         self.status_bar.config(text=f"Landmarks {'enabled' if use_landmarks else 'disabled'}")
         
     def update_odometry_params(self, value=None):
-        """Update odometry parameters"""
+        """Update odometry parameters and return the status text"""
         try:
             total_time = self.total_time_slider.get()
             linear_noise = self.linear_noise_slider.get()
             
             self.odometry_demo.update_parameters(total_time, linear_noise)
-            self.status_bar.config(text=f"Parameters updated: T={total_time}s, noise={linear_noise:.3f}")
+            return f"Parameters updated: T={total_time}s, noise={linear_noise:.3f}"
         except Exception as e:
-            self.status_bar.config(text=f"Error: {str(e)}")
-            
-    def update_odometry_plots(self):
-        """Update odometry plots (called from animation thread)"""
-        try:
-            # Schedule the canvas update in the main thread
-            self.odometry_canvas.draw()
-        except Exception as e:
-            # Ignore errors from background thread updates
-            pass
+            return f"Error: {str(e)}"
             
     def show_about(self):
         """Show about dialog"""
@@ -510,15 +553,8 @@ Created for educational and research purposes.
         
     def run(self):
         """Run the GUI application"""
-        # Initialize first tab
-        self.update_pose()
-        self.pose_canvas.draw()
-        
-        self.update_rotation()
-        self.rotation_canvas.draw()
-        
-        self.update_3d_position()
-        self.pos3d_canvas.draw()
+        # Render the initially selected tab, the others are rendered on first visit
+        self.on_tab_changed()
         
         # Start the main loop
         self.root.mainloop()
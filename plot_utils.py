@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+import math
+import numpy as np
+
+# Half-angle between an arrow shaft and each side of its head, as drawn by Axes3D.quiver
+ARROW_HEAD_COS = math.cos(math.radians(15))
+ARROW_HEAD_SIN = math.sin(math.radians(15))
+
+def quiver_segments(tail, vector, arrow_length_ratio):
+    """Segments of a single Axes3D.quiver arrow: the shaft followed by the two head lines"""
+    # Plain float arithmetic; NumPy dispatch costs more than the math for a single arrow
+    x0, y0, z0 = tail
+    vx, vy, vz = vector
+    tx, ty, tz = x0 + vx, y0 + vy, z0 + vz
+    
+    # Head lines are the shaft rotated by +/-15 degrees about the horizontal axis (x_p, y_p, 0)
+    # normal to it: v*cos + (axis x v)*sin + axis*(axis . v)*(1 - cos)
+    norm_xy = math.hypot(vx, vy)
+    if norm_xy > 0:
+        x_p, y_p = vy / norm_xy, -vx / norm_xy
+    else:
+        x_p, y_p = 0.0, 1.0
+    c, s = ARROW_HEAD_COS, ARROW_HEAD_SIN
+    k = (x_p * vx + y_p * vy) * (1 - c)
+    cross_x, cross_y, cross_z = y_p * vz, -x_p * vz, x_p * vy - y_p * vx
+    base_x, base_y, base_z = c * vx + k * x_p, c * vy + k * y_p, c * vz
+    r = arrow_length_ratio
+    
+    return np.array([
+        [[tx, ty, tz], [x0, y0, z0]],
+        [[tx, ty, tz], [tx - r * (base_x + s * cross_x), ty - r * (base_y + s * cross_y), tz - r * (base_z + s * cross_z)]],
+        [[tx, ty, tz], [tx - r * (base_x - s * cross_x), ty - r * (base_y - s * cross_y), tz - r * (base_z - s * cross_z)]]
+    ])
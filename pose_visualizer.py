@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 
+import math
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.patches import FancyArrowPatch
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 import matplotlib.animation as animation
 
 class PoseVisualizer:
@@ -26,10 +28,31 @@ class PoseVisualizer:
         self.ax.set_xlabel('X')
         self.ax.set_ylabel('Y')
         
-        # Initialize pose elements
-        self.pose_marker = None
-        self.orientation_arrow = None
-        self.coordinate_frame_elements = []  # List to track all frame elements
+        # Initialize pose elements (persistent, animated artists updated in place)
+        self.pose_marker, = self.ax.plot([], [], 'bo', markersize=12, label='Pose', animated=True)
+        
+        # Orientation arrow (blue) and local X/Y axes (red/green) share one LineCollection:
+        # each arrow is a shaft plus two head barbs, all moved with set_segments
+        self.arrow_angles = np.array([0.0, 0.0, np.pi/2])    # Direction in the local frame
+        self.arrow_lengths = np.array([1.0, 0.8, 0.8])
+        self.arrow_head_lengths = np.array([0.3, 0.15, 0.15])
+        self.arrow_head_widths = np.array([0.1, 0.05, 0.05])  # Half width of the head
+        colors = [to_rgba('blue', 0.8), to_rgba('red', 0.6), to_rgba('green', 0.6)]
+        self.frame_lc = LineCollection(np.zeros((9, 2, 2)), colors=np.repeat(colors, 3, axis=0),
+                                       linewidths=np.repeat([2.0, 1.5, 1.5], 3), animated=True)
+        self.ax.add_collection(self.frame_lc, autolim=False)
+        self.arrow_template = self.compute_arrow_template()  # Arrows of the pose (0, 0, 0)
+        self.arrow_segments = np.empty_like(self.arrow_template)
+        self.animated_artists = [self.pose_marker, self.frame_lc]
+        
+        # Legend is built once; it is part of the static background
+        self.ax.legend(handles=[self.pose_marker], labels=['Pose'], loc='upper right')
+        
+        # Static background (grid, world axes, origin, labels) rasterized into a bitmap,
+        # captured on every full draw and dropped when the canvas is resized
+        self._background = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        self.fig.canvas.mpl_connect('resize_event', self._on_resize)
         
         # Draw coordinate axes
         self.draw_coordinate_axes()
@@ -48,53 +71,66 @@ class PoseVisualizer:
         self.ax.plot(0, 0, 'ko', markersize=8)
         self.ax.text(-0.3, -0.3, 'O', fontsize=12)
         
+    def _on_draw(self, event):
+        """Capture the static background and draw the animated artists on top"""
+        canvas = self.fig.canvas
+        if canvas.is_saving():
+            # Animated artists are part of regular draws while saving a figure
+            return
+        self._background = canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+        
+    def _on_resize(self, event):
+        """Forget the cached background, it no longer matches the canvas size"""
+        self._background = None
+        
+    def _draw_animated(self):
+        """Draw all animated artists with the current renderer"""
+        for artist in self.animated_artists:
+            self.ax.draw_artist(artist)
+            
+    def blit(self):
+        """Redraw only the pose artists on top of the cached background"""
+        canvas = self.fig.canvas
+        if self._background is None:
+            # Render the static layers once; the draw_event captures them and draws the pose
+            canvas.draw()
+            return
+        canvas.restore_region(self._background)
+        self._draw_animated()
+        canvas.blit(self.ax.bbox)
+        
     def update_pose(self, x, y, theta):
         """Update the pose visualization"""
-        # Clear previous pose elements
-        if self.pose_marker is not None:
-            self.pose_marker.remove()
-            self.pose_marker = None
-        if self.orientation_arrow is not None:
-            self.orientation_arrow.remove()
-            self.orientation_arrow = None
-            
-        # Clear previous coordinate frame elements
-        for element in self.coordinate_frame_elements:
-            if element is not None:
-                element.remove()
-        self.coordinate_frame_elements.clear()
-            
-        # Draw pose marker
-        self.pose_marker = self.ax.plot(x, y, 'bo', markersize=12, label='Pose')[0]
-        
-        # Draw orientation arrow
-        arrow_length = 1.0
-        dx = arrow_length * np.cos(theta)
-        dy = arrow_length * np.sin(theta)
-        self.orientation_arrow = self.ax.arrow(x, y, dx, dy, head_width=0.2, 
-                                             head_length=0.3, fc='blue', ec='blue', alpha=0.8)
-        
-        # Draw local coordinate frame
-        self.draw_local_frame(x, y, theta)
-        
-        # Update legend
-        self.ax.legend()
-        
-    def draw_local_frame(self, x, y, theta):
-        """Draw the local coordinate frame at the pose"""
-        frame_length = 0.8
-        
-        # Local X-axis (red)
-        dx_x = frame_length * np.cos(theta)
-        dy_x = frame_length * np.sin(theta)
-        self.coordinate_frame_elements.append(self.ax.arrow(x, y, dx_x, dy_x, head_width=0.1, head_length=0.15, 
-                     fc='red', ec='red', alpha=0.6))
-        
-        # Local Y-axis (green)
-        dx_y = frame_length * np.cos(theta + np.pi/2)
-        dy_y = frame_length * np.sin(theta + np.pi/2)
-        self.coordinate_frame_elements.append(self.ax.arrow(x, y, dx_y, dy_y, head_width=0.1, head_length=0.15, 
-                     fc='green', ec='green', alpha=0.6))
+        self.move_pose(x, y, math.cos(theta), math.sin(theta))
+        
+    def move_pose(self, x, y, c, s):
+        """Move the pose artists to (x, y) with heading given as cos/sin"""
+        # Move pose marker
+        self.pose_marker.set_data([x], [y])
+        
+        # Move orientation arrow and local coordinate frame: rotate the local-frame
+        # template by the heading and translate it to (x, y)
+        tx = self.arrow_template[..., 0]
+        ty = self.arrow_template[..., 1]
+        self.arrow_segments[..., 0] = tx * c - ty * s + x
+        self.arrow_segments[..., 1] = tx * s + ty * c + y
+        self.frame_lc.set_segments(self.arrow_segments)
+        
+    def compute_arrow_template(self):
+        """Compute the (9, 2, 2) shaft and head segments of the three arrows in the local frame"""
+        direction = np.stack([np.cos(self.arrow_angles), np.sin(self.arrow_angles)], axis=1)   # (3, 2)
+        normal = np.stack([-direction[:, 1], direction[:, 0]], axis=1)
+        
+        tip = self.arrow_lengths[:, None] * direction
+        head_base = tip - self.arrow_head_lengths[:, None] * direction
+        barb = self.arrow_head_widths[:, None] * normal
+        
+        segments = np.zeros((3, 3, 2, 2))                  # Shaft starts at the origin
+        segments[:, :, 0] = tip[:, None]                    # Shaft and both barbs end at the tip
+        segments[:, 1, 1] = head_base + barb                # Barbs start either side of the head base
+        segments[:, 2, 1] = head_base - barb
+        return segments.reshape(9, 2, 2)
         
     def get_pose_info(self, x, y, theta):
         """Get formatted pose information"""
@@ -106,13 +142,21 @@ class PoseVisualizer:
         
     def animate_pose(self, x_traj, y_traj, theta_traj, interval=100):
         """Animate pose along a trajectory"""
+        # Precompute the whole trajectory up front, frames only index into it
+        x_traj = np.asarray(x_traj, dtype=float)
+        y_traj = np.asarray(y_traj, dtype=float)
+        theta_traj = np.asarray(theta_traj, dtype=float)
+        cos_traj = np.cos(theta_traj)
+        sin_traj = np.sin(theta_traj)
+        
         def animate(frame):
             if frame < len(x_traj):
-                self.update_pose(x_traj[frame], y_traj[frame], theta_traj[frame])
-            return []
+                self.move_pose(x_traj[frame], y_traj[frame], cos_traj[frame], sin_traj[frame])
+            return self.animated_artists
             
+        # Blitting only redraws the persistent pose artists on each frame
         anim = animation.FuncAnimation(self.fig, animate, frames=len(x_traj), 
-                                      interval=interval, blit=False, repeat=True)
+                                      interval=interval, blit=True, repeat=True)
         return anim
 
 def main():
@@ -140,7 +184,7 @@ def main():
         y = y_slider.val
         theta = np.radians(theta_slider.val)
         visualizer.update_pose(x, y, theta)
-        fig.canvas.draw_idle()
+        visualizer.blit()
         
     x_slider.on_changed(update)
     y_slider.on_changed(update)
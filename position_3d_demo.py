@@ -4,7 +4,37 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button, RadioButtons
 from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from matplotlib.colors import to_rgba
+from matplotlib.transforms import Bbox
 import math
+from plot_utils import quiver_segments
+
+# Vector properties panel text, filled in on every update
+PROPERTIES_TEMPLATE = (
+    "Current Position:\n"
+    "r = (%.2f, %.2f, %.2f)\n\n"
+    "Vector Properties:\n"
+    "Magnitude: |r| = %.3f\n\n"
+    "Unit Vector: r̂ = (%.3f, %.3f, %.3f)\n\n"
+    "Components:\n"
+    "  X: %.3f\n"
+    "  Y: %.3f\n"
+    "  Z: %.3f\n\n"
+    "Angles:\n"
+    "  XY-plane: %.1f°\n"
+    "  XZ-plane: %.1f°\n"
+    "  YZ-plane: %.1f°"
+)
+
+def vector_properties(x, y, z):
+    """Magnitude, unit vector and XY/XZ/YZ plane angles (radians) of the vector (x, y, z)"""
+    # Plain float arithmetic; NumPy calls cost more than they compute for 3 values
+    magnitude = math.sqrt(x * x + y * y + z * z)
+    inv_magnitude = 1.0 / magnitude if magnitude > 0 else 0.0
+    return (magnitude,
+            x * inv_magnitude, y * inv_magnitude, z * inv_magnitude,
+            math.atan2(y, x), math.atan2(z, x), math.atan2(z, y))
 
 class Position3DDemo:
     def __init__(self, fig=None):
@@ -23,6 +53,7 @@ class Position3DDemo:
         self.ax1.set_xlim(-3, 3)
         self.ax1.set_ylim(-3, 3)
         self.ax1.set_zlim(-3, 3)
+        self.ax1.set_autoscale_on(False)  # Limits are fixed; never rescan artists for data limits
         self.ax1.set_title('3D Coordinate System & Position Vector', fontsize=14, fontweight='bold')
         self.ax1.set_xlabel('X')
         self.ax1.set_ylabel('Y')
@@ -32,28 +63,61 @@ class Position3DDemo:
         self.ax2 = self.fig.add_subplot(1, 3, 3)
         self.ax2.axis('off')
         self.ax2.set_title('Vector Properties', fontsize=12, fontweight='bold')
+        self.properties_text = self.ax2.text(0.05, 0.95, '', transform=self.ax2.transAxes, 
+                                             fontsize=10, verticalalignment='top', fontfamily='monospace',
+                                             animated=True)
+        
+        # Moving artists are blitted over a cached background of everything else
+        self.animated_artists_3d = []
+        self.animated_axes = []
+        self._background = None
+        self._properties_background = None
+        self._properties_bbox = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        self.fig.canvas.mpl_connect('resize_event', self._on_resize)
         
         # plt.tight_layout()  # Removed to avoid 3D axes compatibility warning
         
     def setup_animation(self):
         """Initialize animation elements"""
-        # Initial position vector
+        # Initial position vector; updated in place from here on
         self.position = np.array([1.5, 1.0, 0.8])
         self.original_position = self.position.copy()
+        self.last_position = None  # Position the plots were last updated for
         
         # Animation state
         self.is_animating = False
         self.animation_speed = 0.02
-        self.rotation_angle = 0.0
+        self.animation_frame = 0
+        
+        # One loop of the circular motion, sampled once per frame; the step is rounded so the loop closes
+        n_frames = int(round(2 * math.pi / self.animation_speed))
+        t = np.arange(n_frames) * (2 * math.pi / n_frames)
+        radius = 2.0
+        self.animation_path = np.column_stack([
+            radius * np.cos(t),
+            radius * np.sin(t),
+            1.0 + 0.5 * np.sin(2 * t)
+        ])
+        
+        # Animation frames are driven by a repeating canvas timer
+        self.animation_timer = self.fig.canvas.new_timer(interval=50)
+        self.animation_timer.add_callback(self.animate)
+        
+        # Slider changes are applied at most once per timer interval
+        self.update_pending = False
+        self.update_timer = self.fig.canvas.new_timer(interval=33)
+        self.update_timer.single_shot = True
+        self.update_timer.add_callback(self.flush_update)
         
         # Coordinate system properties
         self.show_bases = True
         self.show_components = True
         self.show_grid = True
         
-        # Setup plot elements
+        # Setup plot elements and draw the initial position
         self.setup_3d_coordinate_system()
-        self.update_vector_properties()
+        self.update_plots(self.position)
         
     def setup_3d_coordinate_system(self):
         """Setup the main 3D coordinate system"""
@@ -70,53 +134,62 @@ class Position3DDemo:
         
         # Position vector
         self.position_vector = self.ax1.quiver(0, 0, 0, 0, 0, 0, color='purple', alpha=0.8, 
-                                             arrow_length_ratio=0.15, linewidth=3, label='Position Vector')
+                                             arrow_length_ratio=0.15, linewidth=3, label='Position Vector',
+                                             animated=True)
         
         # Position point
         self.position_point = self.ax1.scatter(0, 0, 0, color='purple', s=150, marker='o', 
-                                             label='Position Point')
+                                             label='Position Point', animated=True)
+        
+        # Component vectors: x, y and z arrows (shaft + two head lines each) in one collection
+        component_colors = [to_rgba(color, 0.5) for color in ('red', 'green', 'blue') for _ in range(3)]
+        self.components = Line3DCollection(np.zeros((9, 2, 3)), colors=component_colors, 
+                                           linewidths=1, linestyles='--', animated=True)
+        self.ax1.add_collection3d(self.components)
         
-        # Component vectors
-        self.x_component = self.ax1.quiver(0, 0, 0, 0, 0, 0, color='red', alpha=0.5, 
-                                         arrow_length_ratio=0.1, linewidth=1, linestyle='--')
-        self.y_component = self.ax1.quiver(0, 0, 0, 0, 0, 0, color='green', alpha=0.5, 
-                                         arrow_length_ratio=0.1, linewidth=1, linestyle='--')
-        self.z_component = self.ax1.quiver(0, 0, 0, 0, 0, 0, color='blue', alpha=0.5, 
-                                         arrow_length_ratio=0.1, linewidth=1, linestyle='--')
+        self.animated_artists_3d = [self.position_vector, self.position_point, self.components]
         
         # Grid lines
         self.setup_grid_lines()
         
-        self.ax1.legend()
+        # Built once: update_3d_plot mutates these artists in place, so the handles stay valid
+        self.legend_handles = [self.origin, self.x_axis, self.y_axis, self.z_axis,
+                               self.position_vector, self.position_point]
+        self.ax1.legend(handles=self.legend_handles)
+        
+        # Optional layers start out as configured in setup_animation; the first draw shows them
+        self._apply_layer_visibility()
         
     def setup_grid_lines(self):
         """Setup grid lines for the coordinate system"""
-        # Create grid points
-        x_grid = np.linspace(-2, 2, 5)
-        y_grid = np.linspace(-2, 2, 5)
-        z_grid = np.linspace(-2, 2, 5)
-        
-        # X-direction grid lines
-        for y in y_grid:
-            for z in z_grid:
-                self.ax1.plot([-2, 2], [y, y], [z, z], 'k-', alpha=0.1, linewidth=0.5)
-        
-        # Y-direction grid lines
-        for x in x_grid:
-            for z in z_grid:
-                self.ax1.plot([x, x], [-2, 2], [z, z], 'k-', alpha=0.1, linewidth=0.5)
-        
-        # Z-direction grid lines
-        for x in x_grid:
-            for y in y_grid:
-                self.ax1.plot([x, x], [y, y], [-2, 2], 'k-', alpha=0.1, linewidth=0.5)
-        
-        
+        # Create grid points; every (a, b) pair of grid values anchors one line per direction
+        grid = np.linspace(-2, 2, 5)
+        a, b = (values.ravel() for values in np.meshgrid(grid, grid, indexing='ij'))
+        n = a.size
+        
+        # Line endpoints, (3 directions * 25 lines, 2 points, xyz): each line spans -2..2 along its
+        # own direction and takes (a, b) on the two other axes
+        directions = np.arange(3)
+        others = np.array([[1, 2], [0, 2], [0, 1]])
+        segments = np.empty((3, n, 2, 3))
+        segments[directions, :, :, directions] = [-2, 2]
+        segments[directions, :, :, others[:, 0]] = a[:, None]
+        segments[directions, :, :, others[:, 1]] = b[:, None]
+        
+        # Draw all grid lines as a single artist
+        self.grid_lines = Line3DCollection(segments.reshape(-1, 2, 3), colors='k', alpha=0.1, linewidths=0.5)
+        self.ax1.add_collection3d(self.grid_lines)
         
     def update_plots(self, position):
         """Update all plots with new position"""
         self.position = position
         
+        # Skip the update when the plots already show this position
+        position_key = tuple(position)
+        if position_key == self.last_position:
+            return
+        self.last_position = position_key
+        
         # Update main 3D plot
         self.update_3d_plot()
         
@@ -125,65 +198,131 @@ class Position3DDemo:
         
     def update_3d_plot(self):
         """Update the main 3D coordinate system plot"""
-        # Update position vector
-        if hasattr(self, 'position_vector') and self.position_vector:
-            self.position_vector.remove()
-        self.position_vector = self.ax1.quiver(0, 0, 0, self.position[0], self.position[1], self.position[2], 
-                                             color='purple', alpha=0.8, arrow_length_ratio=0.15, linewidth=3)
-        
-        # Update position point
-        if hasattr(self, 'position_point') and self.position_point:
-            self.position_point.remove()
-        self.position_point = self.ax1.scatter(self.position[0], self.position[1], self.position[2], 
-                                             color='purple', s=150, marker='o')
-        
-        # Update component vectors
-        if hasattr(self, 'x_component') and self.x_component:
-            self.x_component.remove()
-        if hasattr(self, 'y_component') and self.y_component:
-            self.y_component.remove()
-        if hasattr(self, 'z_component') and self.z_component:
-            self.z_component.remove()
-        
-        self.x_component = self.ax1.quiver(0, 0, 0, self.position[0], 0, 0, color='red', alpha=0.5, 
-                                         arrow_length_ratio=0.1, linewidth=1, linestyle='--')
-        self.y_component = self.ax1.quiver(self.position[0], 0, 0, 0, self.position[1], 0, color='green', alpha=0.5, 
-                                         arrow_length_ratio=0.1, linewidth=1, linestyle='--')
-        self.z_component = self.ax1.quiver(self.position[0], self.position[1], 0, 0, 0, self.position[2], color='blue', alpha=0.5, 
-                                         arrow_length_ratio=0.1, linewidth=1, linestyle='--')
+        px, py, pz = self.position
+        
+        # Move the existing artists instead of re-creating them
+        self.position_vector.set_segments(quiver_segments((0, 0, 0), (px, py, pz), 0.15))
+        self.position_point._offsets3d = ([px], [py], [pz])
+        
+        # Update component vectors (skipped while hidden, refreshed when shown again)
+        if self.show_components:
+            self.update_components()
+            
+    def update_components(self):
+        """Update the dashed x, y and z component arrows"""
+        px, py, pz = self.position
+        self.components.set_segments(np.concatenate([
+            quiver_segments((0, 0, 0), (px, 0, 0), 0.1),
+            quiver_segments((px, 0, 0), (0, py, 0), 0.1),
+            quiver_segments((px, py, 0), (0, 0, pz), 0.1)
+        ]))
+        
+    def set_layer_visibility(self, show_bases=None, show_components=None, show_grid=None):
+        """Show or hide the optional basis axes, component arrows and grid layers"""
+        if show_bases is not None:
+            self.show_bases = show_bases
+        if show_components is not None:
+            self.show_components = show_components
+        if show_grid is not None:
+            self.show_grid = show_grid
+        self._apply_layer_visibility()
+        
+        # Before the first draw there is nothing on screen to refresh
+        if self._background is None:
+            return
+        if show_bases is None and show_grid is None:
+            # Only the animated component arrows changed
+            self.blit()
+        else:
+            # Basis axes and grid are part of the cached background, so it has to be redrawn
+            self.fig.canvas.draw_idle()
+        
+    def _apply_layer_visibility(self):
+        """Set the visibility of the optional layers from the show_* flags without drawing"""
+        for basis in (self.x_axis, self.y_axis, self.z_axis):
+            basis.set_visible(self.show_bases)
+        self.grid_lines.set_visible(self.show_grid)
+        self.components.set_visible(self.show_components)
+        if self.show_components:
+            self.update_components()
         
     def update_vector_properties(self):
         """Update vector properties display"""
-        self.ax2.clear()
-        self.ax2.axis('off')
-        self.ax2.set_title('Vector Properties', fontsize=12, fontweight='bold')
-        
         # Calculate vector properties
-        magnitude = np.linalg.norm(self.position)
-        unit_vector = self.position / magnitude if magnitude > 0 else np.zeros(3)
-        
-        # Calculate angles
-        angle_xy = np.arctan2(self.position[1], self.position[0])  # Angle in XY plane
-        angle_xz = np.arctan2(self.position[2], self.position[0])  # Angle in XZ plane
-        angle_yz = np.arctan2(self.position[2], self.position[1])  # Angle in YZ plane
-        
-        # Display properties
-        properties_text = f"Current Position:\n"
-        properties_text += f"r = ({self.position[0]:.2f}, {self.position[1]:.2f}, {self.position[2]:.2f})\n\n"
-        properties_text += f"Vector Properties:\n"
-        properties_text += f"Magnitude: |r| = {magnitude:.3f}\n\n"
-        properties_text += f"Unit Vector: r̂ = ({unit_vector[0]:.3f}, {unit_vector[1]:.3f}, {unit_vector[2]:.3f})\n\n"
-        properties_text += f"Components:\n"
-        properties_text += f"  X: {self.position[0]:.3f}\n"
-        properties_text += f"  Y: {self.position[1]:.3f}\n"
-        properties_text += f"  Z: {self.position[2]:.3f}\n\n"
-        properties_text += f"Angles:\n"
-        properties_text += f"  XY-plane: {np.degrees(angle_xy):.1f}°\n"
-        properties_text += f"  XZ-plane: {np.degrees(angle_xz):.1f}°\n"
-        properties_text += f"  YZ-plane: {np.degrees(angle_yz):.1f}°"
-        
-        self.ax2.text(0.05, 0.95, properties_text, transform=self.ax2.transAxes, 
-                     fontsize=10, verticalalignment='top', fontfamily='monospace')
+        px, py, pz = self.position
+        magnitude, ux, uy, uz, angle_xy, angle_xz, angle_yz = vector_properties(px, py, pz)
+        
+        # Display properties in the persistent text artist
+        self.properties_text.set_text(PROPERTIES_TEMPLATE % (
+            px, py, pz,
+            magnitude,
+            ux, uy, uz,
+            px, py, pz,
+            math.degrees(angle_xy), math.degrees(angle_xz), math.degrees(angle_yz)
+        ))
+        
+    def _on_draw(self, event):
+        """Capture the static background and draw the animated artists on top"""
+        if self.fig.canvas.is_saving():
+            # Animated artists inside axes are part of regular draws while saving, animated axes are not
+            for ax in self.animated_axes:
+                ax.draw(event.renderer)
+            return
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        # The monospace properties text overflows ax2 to the right, so its region runs to the figure edge
+        ax2_box = self.ax2.bbox
+        self._properties_bbox = Bbox.from_extents(ax2_box.x0, ax2_box.y0, self.fig.bbox.x1, ax2_box.y1)
+        self._properties_background = self.fig.canvas.copy_from_bbox(self._properties_bbox)
+        self._draw_animated()
+        
+    def _on_resize(self, event):
+        """Forget the cached backgrounds, they no longer match the canvas size"""
+        self._background = None
+        self._properties_background = None
+        
+    def _draw_animated(self):
+        """Draw all animated artists with the current renderer"""
+        for artist in self.animated_artists_3d:
+            if not artist.get_visible():
+                continue
+            # Project the latest 3D data; regular draws do this in Axes3D.draw
+            artist.do_3d_projection()
+            self.ax1.draw_artist(artist)
+        self.ax2.draw_artist(self.properties_text)
+        for ax in self.animated_axes:
+            self.fig.draw_artist(ax)
+            
+    def blit(self):
+        """Redraw only the animated artists on top of the cached background"""
+        canvas = self.fig.canvas
+        if self._background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        for artist in self.animated_artists_3d:
+            if not artist.get_visible():
+                continue
+            # Project the latest 3D data; regular draws do this in Axes3D.draw
+            artist.do_3d_projection()
+            self.ax1.draw_artist(artist)
+        for ax in self.animated_axes:
+            self.fig.draw_artist(ax)
+        
+        # Copy only the regions that change to the screen; the properties panel has its own blit
+        canvas.blit(self.ax1.bbox)
+        for ax in self.animated_axes:
+            canvas.blit(ax.bbox)
+        self.blit_properties()
+        
+    def blit_properties(self):
+        """Redraw the properties text over the cached background of its panel and blit that panel only"""
+        canvas = self.fig.canvas
+        if self._properties_background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._properties_background)
+        self.ax2.draw_artist(self.properties_text)
+        canvas.blit(self._properties_bbox)
         
     def setup_controls(self):
         """Setup interactive controls"""
@@ -223,6 +362,12 @@ class Position3DDemo:
         self.reset_button = Button(ax_reset, 'Reset', color='lightcoral')
         self.reset_button.on_clicked(self.reset_position)
         
+        # Sliders follow the animation, so when they share the figure they are blitted with it
+        self.animated_axes = [slider.ax for slider in (self.x_slider, self.y_slider, self.z_slider)
+                              if slider.ax.figure is self.fig]
+        for ax in self.animated_axes:
+            ax.set_animated(True)
+        
         # Display current position
         # Note: Removed the controls panel display since we removed ax5
         # The position is now shown in the vector properties panel
@@ -230,20 +375,30 @@ class Position3DDemo:
     def on_x_change(self, val):
         """Handle X coordinate change"""
         self.position[0] = val
-        self.update_plots(self.position)
-        self.update_position_display()
+        self.schedule_update()
         
     def on_y_change(self, val):
         """Handle Y coordinate change"""
         self.position[1] = val
-        self.update_plots(self.position)
-        self.update_position_display()
+        self.schedule_update()
         
     def on_z_change(self, val):
         """Handle Z coordinate change"""
         self.position[2] = val
+        self.schedule_update()
+        
+    def schedule_update(self):
+        """Schedule a coalesced update for the current position"""
+        if not self.update_pending:
+            self.update_pending = True
+            self.update_timer.start()
+            
+    def flush_update(self):
+        """Apply the latest slider values and redraw"""
+        self.update_pending = False
         self.update_plots(self.position)
         self.update_position_display()
+        self.fig.canvas.draw_idle()
         
     def update_position_display(self):
         """Update position display"""
@@ -256,64 +411,48 @@ class Position3DDemo:
         if self.is_animating:
             self.play_button.label.set_text('Stop')
             self.play_button.color = 'lightyellow'
-            self.animate()
+            self.animation_timer.start()
         else:
+            self.animation_timer.stop()
             self.play_button.label.set_text('Animate')
             self.play_button.color = 'lightgreen'
+        self.fig.canvas.draw_idle()
             
     def animate(self):
-        """Animate position vector movement"""
+        """Advance the position vector animation by one frame"""
         if not self.is_animating:
             return
             
-        # Create a circular motion in XY plane
-        t = self.rotation_angle
-        radius = 2.0
-        height = 1.0 + 0.5 * np.sin(2 * t)
-        
-        new_position = np.array([
-            radius * np.cos(t),
-            radius * np.sin(t),
-            height
-        ])
-        
-        # Update sliders and position
-        self.x_slider.set_val(new_position[0])
-        self.y_slider.set_val(new_position[1])
-        self.z_slider.set_val(new_position[2])
+        # Next point of the circular motion in XY plane, copied into the existing position buffer
+        self.position[:] = self.animation_path[self.animation_frame % len(self.animation_path)]
+        self.animation_frame += 1
         
-        self.position = new_position
-        self.rotation_angle += self.animation_speed
+        # Update sliders
+        self.set_sliders(self.position)
         
-        # Update plots
+        # Update plots and blit the moving artists
         self.update_plots(self.position)
         self.update_position_display()
-        
-        # Schedule next frame
-        if self.is_animating:
-            try:
-                if hasattr(self.fig.canvas, 'get_tk_widget'):
-                    self.fig.canvas.get_tk_widget().after(50, self.animate)
-                else:
-                    plt.pause(0.05)
-                    if self.is_animating:
-                        self.animate()
-            except:
-                plt.pause(0.05)
-                if self.is_animating:
-                    self.animate()
+        self.blit()
+            
+    def set_sliders(self, position):
+        """Move the sliders to position without triggering their callbacks or a redraw"""
+        sliders = (self.x_slider, self.y_slider, self.z_slider)
+        for slider, value in zip(sliders, position):
+            slider.eventson = slider.drawon = False
+            slider.set_val(value)
+            slider.eventson = slider.drawon = True
             
     def reset_position(self, event):
         """Reset position to original"""
-        self.position = self.original_position.copy()
-        self.rotation_angle = 0.0
+        self.position[:] = self.original_position
+        self.animation_frame = 0
         
-        self.x_slider.set_val(self.position[0])
-        self.y_slider.set_val(self.position[1])
-        self.z_slider.set_val(self.position[2])
+        self.set_sliders(self.position)
         
         self.update_plots(self.position)
         self.update_position_display()
+        self.fig.canvas.draw_idle()
         
         if self.is_animating:
             self.toggle_animation(None)  # Stop animation
@@ -324,8 +463,10 @@ class Position3DDemo:
 
     def update_position(self, x, y, z):
         """Update position (for GUI integration)"""
-        position = np.array([x, y, z])
-        self.update_plots(position)
+        self.position[0] = x
+        self.position[1] = y
+        self.position[2] = z
+        self.update_plots(self.position)
 
 def main():
     """Main function to run the 3D position demonstration"""
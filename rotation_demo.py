@@ -3,8 +3,15 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import math
-import threading
+from functools import lru_cache
+from plot_utils import quiver_segments
+
+@lru_cache(maxsize=2048)
+def rotation_cos_sin(theta):
+    """Cached (cos, sin) of a rotation angle (the slider and animation revisit the same angles)"""
+    return math.cos(theta), math.sin(theta)
 
 class RotationDemo:
     def __init__(self, fig=None):
@@ -42,14 +49,25 @@ class RotationDemo:
         self.ax3 = self.fig.add_subplot(3, 2, 5)
         self.ax3.axis('off')
         self.ax3.set_title('Rotation Matrix', fontsize=12, fontweight='bold')
+        self.matrix_text = self.ax3.text(0.1, 0.9, '', transform=self.ax3.transAxes,
+                                         fontsize=10, verticalalignment='top', fontfamily='monospace',
+                                         animated=True)
         
         # Rotation Formula Display
         self.ax4 = self.fig.add_subplot(3, 2, 6)
         self.ax4.axis('off')
         self.ax4.set_title('Rotation Formulas', fontsize=12, fontweight='bold')
+        self.formula_text = self.ax4.text(0.1, 0.9, '', transform=self.ax4.transAxes,
+                                          fontsize=9, verticalalignment='top', fontfamily='monospace')
         
         # plt.tight_layout()  # Removed to avoid compatibility warning
         
+        # Blitting: the rotating artists are animated and drawn over a cached background
+        self.animated_axes = []
+        self._background = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        self.fig.canvas.mpl_connect('resize_event', self._on_resize)
+        
     def setup_animation(self):
         """Initialize animation elements"""
         # Initial vectors
@@ -60,11 +78,33 @@ class RotationDemo:
         self.original_vector_2d = self.vector_2d.copy()
         self.original_vector_3d = self.vector_3d.copy()
         
+        # Full-turn trajectory of the 2D vector, sliced up to theta on every update
+        self.path_angles = np.linspace(0, 2*np.pi, 720)
+        cos_grid, sin_grid = np.cos(self.path_angles), np.sin(self.path_angles)
+        vx, vy = self.original_vector_2d
+        self.path_grid_x = cos_grid*vx - sin_grid*vy
+        self.path_grid_y = sin_grid*vx + cos_grid*vy
+        # Drawn path buffers: a prefix of the grid plus the exact end point
+        self.path_x = np.empty(len(self.path_angles) + 1)
+        self.path_y = np.empty(len(self.path_angles) + 1)
+        
         # Animation state
         self.theta = 0.0
+        self._last_theta = None
         self.is_animating = False
         self.animation_speed = 0.05
         
+        # Animation frames are driven by a repeating canvas timer
+        self.animation_timer = self.fig.canvas.new_timer(interval=50)
+        self.animation_timer.add_callback(self.animate)
+        
+        # Slider changes are applied at most once per timer interval
+        self.pending_theta = self.theta
+        self.update_pending = False
+        self.update_timer = self.fig.canvas.new_timer(interval=33)
+        self.update_timer.single_shot = True
+        self.update_timer.add_callback(self.flush_update)
+        
         # Setup plot elements
         self.setup_2d_vector_plot()
         self.setup_3d_vector_plot()
@@ -73,14 +113,16 @@ class RotationDemo:
         
     def setup_2d_vector_plot(self):
         """Setup 2D vector rotation plot"""
-        # Original vector
-        self.vector_orig = self.ax1.arrow(0, 0, 0, 0, head_width=0.05, head_length=0.1, 
+        # Original vector (never rotates, so it is part of the static background)
+        self.vector_orig = self.ax1.arrow(0, 0, self.original_vector_2d[0], self.original_vector_2d[1],
+                                        head_width=0.05, head_length=0.1, 
                                         fc='blue', ec='blue', alpha=0.7, label='Original Vector')
         self.vector_rot = self.ax1.arrow(0, 0, 0, 0, head_width=0.05, head_length=0.1, 
-                                       fc='red', ec='red', alpha=0.7, label='Rotated Vector')
+                                       fc='red', ec='red', alpha=0.7, label='Rotated Vector',
+                                       animated=True)
         
         # Vector path
-        self.vector_path, = self.ax1.plot([], [], 'r-', alpha=0.3, linewidth=1)
+        self.vector_path, = self.ax1.plot([], [], 'r-', alpha=0.3, linewidth=1, animated=True)
         
         # Center point
         self.center_point_2d = self.ax1.plot(0, 0, 'k+', markersize=10, markeredgewidth=2)[0]
@@ -89,14 +131,16 @@ class RotationDemo:
         
     def setup_3d_vector_plot(self):
         """Setup 3D vector rotation plot"""
-        # Original vector
-        self.vector3d_orig = self.ax2.quiver(0, 0, 0, 0, 0, 0, color='blue', alpha=0.7, 
+        # Original vector (static)
+        self.vector3d_orig = self.ax2.quiver(0, 0, 0, *self.original_vector_3d, color='blue', alpha=0.7, 
                                            arrow_length_ratio=0.2, label='Original Vector')
-        self.vector3d_rot = self.ax2.quiver(0, 0, 0, 0, 0, 0, color='red', alpha=0.7, 
-                                          arrow_length_ratio=0.2, label='Rotated Vector')
+        # Rotated vector: a quiver-shaped Line3DCollection that update_plots moves with set_segments
+        self.vector3d_rot = Line3DCollection(quiver_segments((0, 0, 0), self.original_vector_3d, 0.2),
+                                             colors='red', alpha=0.7, label='Rotated Vector', animated=True)
+        self.ax2.add_collection3d(self.vector3d_rot)
         
-        # Rotation axis
-        self.rotation_axis = self.ax2.quiver(0, 0, 0, 0, 0, 0, color='green', alpha=0.5, 
+        # Rotation axis (always +Z, so it is part of the static background)
+        self.rotation_axis = self.ax2.quiver(0, 0, 0, 0, 0, 1, color='green', alpha=0.5, 
                                            arrow_length_ratio=0.3, linewidth=3, label='Rotation Axis')
         
         # Center point
@@ -104,103 +148,99 @@ class RotationDemo:
         
         self.ax2.legend()
         
-    def rotation_matrix_2d(self, theta):
-        """2D rotation matrix"""
-        return np.array([
-            [np.cos(theta), -np.sin(theta)],
-            [np.sin(theta), np.cos(theta)]
-        ])
-    
-    def rotation_matrix_3d_z(self, theta):
-        """3D rotation matrix around Z-axis"""
-        return np.array([
-            [np.cos(theta), -np.sin(theta), 0],
-            [np.sin(theta), np.cos(theta), 0],
-            [0, 0, 1]
-        ])
-    
     def update_plots(self, theta):
         """Update all plots with new rotation angle"""
         self.theta = theta
+        # The animation sets the slider and then updates, so the same angle often arrives twice
+        if theta == self._last_theta:
+            return
+        self._last_theta = theta
+        
+        # Closed-form rotation on plain floats; a matrix product costs more than it computes here
+        c, s = rotation_cos_sin(round(theta, 4))
         
         # 2D Vector Rotation
-        R_2d = self.rotation_matrix_2d(theta)
-        rotated_vector = R_2d @ self.original_vector_2d
-        
-        self.vector_orig.remove()
-        self.vector_rot.remove()
-        
-        self.vector_orig = self.ax1.arrow(0, 0, self.original_vector_2d[0], self.original_vector_2d[1], 
-                                        head_width=0.05, head_length=0.1, fc='blue', ec='blue', alpha=0.7)
-        self.vector_rot = self.ax1.arrow(0, 0, rotated_vector[0], rotated_vector[1], 
-                                       head_width=0.05, head_length=0.1, fc='red', ec='red', alpha=0.7)
-        
-        # Update vector path
-        path_x = []
-        path_y = []
-        for angle in np.linspace(0, theta, 50):
-            R_path = self.rotation_matrix_2d(angle)
-            vector_path = R_path @ self.original_vector_2d
-            path_x.append(vector_path[0])
-            path_y.append(vector_path[1])
-        self.vector_path.set_data(path_x, path_y)
+        vx, vy = self.original_vector_2d
+        rotated_vector = (c*vx - s*vy, s*vx + c*vy)
+        
+        # Move the existing arrow instead of replacing it
+        self.vector_rot.set_data(dx=rotated_vector[0], dy=rotated_vector[1])
+        
+        # Update vector path: the precomputed samples with angle <= theta, ending at the rotated vector
+        n = int(theta / self.path_angles[1]) + 1
+        n = min(max(n, 1), len(self.path_angles))
+        self.path_x[:n] = self.path_grid_x[:n]
+        self.path_y[:n] = self.path_grid_y[:n]
+        self.path_x[n], self.path_y[n] = rotated_vector
+        self.vector_path.set_data(self.path_x[:n + 1], self.path_y[:n + 1])
         
         # 3D Vector Rotation (around Z-axis)
-        R_3d = self.rotation_matrix_3d_z(theta)
-        rotated_vector_3d = R_3d @ self.original_vector_3d
-        
-        # Update 3D vectors
-        if hasattr(self, 'vector3d_orig') and self.vector3d_orig:
-            self.vector3d_orig.remove()
-        if hasattr(self, 'vector3d_rot') and self.vector3d_rot:
-            self.vector3d_rot.remove()
-        if hasattr(self, 'rotation_axis') and self.rotation_axis:
-            self.rotation_axis.remove()
-        
-        self.vector3d_orig = self.ax2.quiver(0, 0, 0, self.original_vector_3d[0], 
-                                           self.original_vector_3d[1], self.original_vector_3d[2], 
-                                           color='blue', alpha=0.7, arrow_length_ratio=0.2)
-        self.vector3d_rot = self.ax2.quiver(0, 0, 0, rotated_vector_3d[0], 
-                                          rotated_vector_3d[1], rotated_vector_3d[2], 
-                                          color='red', alpha=0.7, arrow_length_ratio=0.2)
-        self.rotation_axis = self.ax2.quiver(0, 0, 0, 0, 0, 1, color='green', alpha=0.5, 
-                                           arrow_length_ratio=0.3, linewidth=3)
+        x, y, z = self.original_vector_3d
+        rotated_vector_3d = (c*x - s*y, s*x + c*y, z)
+        
+        # Update the 3D vector in place
+        self.vector3d_rot.set_segments(quiver_segments((0, 0, 0), rotated_vector_3d, 0.2))
         
         # Update displays
         self.update_rotation_matrix_display()
         
     def update_rotation_matrix_display(self):
         """Update rotation matrix display"""
-        self.ax3.clear()
-        self.ax3.axis('off')
-        self.ax3.set_title('Rotation Matrix', fontsize=12, fontweight='bold')
-        
-        # 2D rotation matrix
-        R_2d = self.rotation_matrix_2d(self.theta)
+        # 2D rotation matrix entries, from the same cached cos/sin pair as the plots
+        c, s = rotation_cos_sin(round(self.theta, 4))
         
         matrix_text = "2D Rotation Matrix:\n"
         matrix_text += f"R(θ) = [cos(θ)  -sin(θ)]\n"
         matrix_text += f"       [sin(θ)   cos(θ)]\n\n"
         matrix_text += f"θ = {self.theta:.2f} rad = {np.degrees(self.theta):.1f}°\n\n"
-        matrix_text += f"R = [{R_2d[0,0]:.3f}  {R_2d[0,1]:.3f}]\n"
-        matrix_text += f"    [{R_2d[1,0]:.3f}  {R_2d[1,1]:.3f}]"
+        matrix_text += f"R = [{c:.3f}  {-s:.3f}]\n"
+        matrix_text += f"    [{s:.3f}  {c:.3f}]"
         
-        self.ax3.text(0.1, 0.9, matrix_text, transform=self.ax3.transAxes, 
-                     fontsize=10, verticalalignment='top', fontfamily='monospace')
+        self.matrix_text.set_text(matrix_text)
         
     def update_formula_display(self):
-        """Update formula display"""
-        self.ax4.clear()
-        self.ax4.axis('off')
-        self.ax4.set_title('Rotation Formulas', fontsize=12, fontweight='bold')
-        
+        """Update formula display (static, set once during setup)"""
         formula_text = "3D Vector Rotation (Z-axis):\n"
         formula_text += "x' = x·cos(θ) - y·sin(θ)\n"
         formula_text += "y' = x·sin(θ) + y·cos(θ)\n"
         formula_text += "z' = z"
         
-        self.ax4.text(0.1, 0.9, formula_text, transform=self.ax4.transAxes, 
-                     fontsize=9, verticalalignment='top', fontfamily='monospace')
+        self.formula_text.set_text(formula_text)
+        
+    def _on_draw(self, event):
+        """Capture the static background and draw the animated artists on top"""
+        if self.fig.canvas.is_saving():
+            # Animated artists inside axes are part of regular draws while saving, animated axes are not
+            for ax in self.animated_axes:
+                ax.draw(event.renderer)
+            return
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+        
+    def _on_resize(self, event):
+        """Forget the cached background, it no longer matches the canvas size"""
+        self._background = None
+        
+    def _draw_animated(self):
+        """Draw all animated artists with the current renderer"""
+        for artist in (self.vector_path, self.vector_rot):
+            self.ax1.draw_artist(artist)
+        # Project the latest 3D data; regular draws do this in Axes3D.draw
+        self.vector3d_rot.do_3d_projection()
+        self.ax2.draw_artist(self.vector3d_rot)
+        self.ax3.draw_artist(self.matrix_text)
+        for ax in self.animated_axes:
+            self.fig.draw_artist(ax)
+            
+    def blit(self):
+        """Redraw only the animated artists on top of the cached background"""
+        canvas = self.fig.canvas
+        if self._background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        self._draw_animated()
+        canvas.blit(self.fig.bbox)
         
     def setup_controls(self):
         """Setup interactive controls (optional for GUI usage)"""
@@ -225,14 +265,32 @@ class RotationDemo:
             self.reset_button = Button(ax_reset, 'Reset', color='lightcoral')
             self.reset_button.on_clicked(self.reset_animation)
             
+            # The slider follows the animation, so when it shares the figure it is blitted with it
+            if self.theta_slider.ax.figure is self.fig:
+                self.animated_axes = [self.theta_slider.ax]
+                self.theta_slider.ax.set_animated(True)
+            
         except Exception as e:
             # If controls setup fails (e.g., in GUI mode), just continue
             print(f"Controls setup skipped: {e}")
             
     def on_slider_change(self, val):
         """Handle slider change"""
-        self.update_plots(val)
+        self.pending_theta = val
+        self.schedule_update()
+        
+    def schedule_update(self):
+        """Schedule a coalesced update for the latest slider angle"""
+        if not self.update_pending:
+            self.update_pending = True
+            self.update_timer.start()
+            
+    def flush_update(self):
+        """Apply the latest slider angle and redraw"""
+        self.update_pending = False
+        self.update_plots(self.pending_theta)
         self.update_angle_display()
+        self.fig.canvas.draw_idle()
         
     def update_angle_display(self):
         """Update angle display"""
@@ -245,13 +303,15 @@ class RotationDemo:
         if self.is_animating:
             self.play_button.label.set_text('Pause')
             self.play_button.color = 'lightyellow'
-            self.animate()
+            self.animation_timer.start()
         else:
+            self.animation_timer.stop()
             self.play_button.label.set_text('Play')
             self.play_button.color = 'lightgreen'
+        self.fig.canvas.draw_idle()
             
     def animate(self):
-        """Animate rotation"""
+        """Advance the rotation animation by one frame"""
         if not self.is_animating:
             return
             
@@ -261,29 +321,19 @@ class RotationDemo:
             self.theta = 0
             
         # Update slider
-        self.theta_slider.set_val(self.theta)
+        self.set_slider(self.theta)
         
-        # Update plots and redraw
+        # Update plots and blit the moving artists
         self.update_plots(self.theta)
         self.update_angle_display()
-        self.fig.canvas.draw()
+        self.blit()
         
-        # Schedule next frame using a timer that works with any backend
-        if self.is_animating:
-            try:
-                # Try to use the canvas timer if available
-                if hasattr(self.fig.canvas, 'get_tk_widget'):
-                    self.fig.canvas.get_tk_widget().after(50, self.animate)
-                else:
-                    # Fallback: use a simple approach
-                    plt.pause(0.05)
-                    if self.is_animating:
-                        self.animate()
-            except:
-                # Final fallback
-                plt.pause(0.05)
-                if self.is_animating:
-                    self.animate()
+    def set_slider(self, theta):
+        """Move the slider to theta without triggering its callback or a redraw"""
+        slider = self.theta_slider
+        slider.eventson = slider.drawon = False
+        slider.set_val(theta)
+        slider.eventson = slider.drawon = True
         
     def reset_animation(self, event):
         """Reset animation to initial state"""
@@ -303,11 +353,12 @@ class RotationDemo:
     def start_animation(self):
         """Start animation (for GUI integration)"""
         self.is_animating = True
-        self.animate()
+        self.animation_timer.start()
         
     def stop_animation(self):
         """Stop animation (for GUI integration)"""
         self.is_animating = False
+        self.animation_timer.stop()
         
     def reset(self):
         """Reset to initial state (for GUI integration)"""
@@ -5,20 +5,122 @@ import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button, CheckButtons, TextBox
 import math
 from scipy.spatial.distance import cdist
-import threading
-import time
+from scipy.linalg import cho_factor, cho_solve
+
+def wrap_angle(angle):
+    """Wrap an angle (scalar or array) to [-pi, pi)"""
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+def ekf_predict_core(x, P, linear_vel, angular_vel, dt, Q_scaled_diag, F, FP):
+    """EKF prediction for the differential drive model, returns the new (x, P)
+    
+    Q_scaled_diag holds the diagonal of the (diagonal) scaled process noise.
+    F and FP are 3x3 scratch arrays owned by the caller: F must start as the identity
+    (only its heading column is overwritten), FP receives the intermediate F @ P.
+    """
+    theta = x[2]
+    cos_theta = math.cos(theta)
+    sin_theta = math.sin(theta)
+    
+    # Predict new state
+    new_x = x[0] + linear_vel * dt * cos_theta
+    new_y = x[1] + linear_vel * dt * sin_theta
+    new_theta = theta + angular_vel * dt
+    
+    # Normalize angle
+    new_theta = wrap_angle(new_theta)
+    
+    # State transition matrix (Jacobian of motion model), filled in place
+    F[0, 2] = -linear_vel * dt * sin_theta
+    F[1, 2] = linear_vel * dt * cos_theta
+    
+    np.dot(F, P, out=FP)
+    P = FP @ F.T
+    P.flat[::4] += Q_scaled_diag
+    
+    return np.array([new_x, new_y, new_theta]), P
+
+def ekf_update_core(x, P, landmarks, landmark_measurements, R, innovation_gate=0.0):
+    """EKF update with one (range, bearing) measurement per landmark, returns the new (x, P)
+    
+    Row i of landmark_measurements belongs to landmarks[i], so both must have the same length.
+    All landmarks are stacked into a single measurement vector and applied in one Kalman step.
+    Landmarks whose innovation, normalized by R, is below innovation_gate are skipped (0 keeps all).
+    """
+    if len(landmark_measurements) != len(landmarks):
+        raise ValueError(f"expected one measurement per landmark ({len(landmarks)}), "
+                         f"got {len(landmark_measurements)}")
+    lx, ly, theta = x
+    
+    # Predicted measurements and innovations
+    dx = landmarks[:, 0] - lx
+    dy = landmarks[:, 1] - ly
+    predicted_range = np.hypot(dx, dy)
+    range_innovation = landmark_measurements[:, 0] - predicted_range
+    bearing_innovation = wrap_angle(landmark_measurements[:, 1] - (np.arctan2(dy, dx) - theta))
+    
+    # Drop landmarks too close to the robot (Jacobian singularity) and, if gated,
+    # measurements that agree with the prediction to within the noise floor
+    valid = predicted_range > 0.1
+    if innovation_gate > 0:
+        valid &= range_innovation**2 / R[0, 0] + bearing_innovation**2 / R[1, 1] >= innovation_gate
+    if not valid.any():
+        return x, P
+    dx, dy, predicted_range = dx[valid], dy[valid], predicted_range[valid]
+    
+    # Measurement Jacobian, rows interleaved as (range, bearing) per landmark
+    count = len(predicted_range)
+    H = np.zeros((2 * count, 3))
+    H[0::2, 0] = -dx / predicted_range
+    H[0::2, 1] = -dy / predicted_range
+    H[1::2, 0] = dy / predicted_range**2
+    H[1::2, 1] = -dx / predicted_range**2
+    H[1::2, 2] = -1
+    
+    # Innovation vector in the same interleaved order
+    innovation = np.empty(2 * count)
+    innovation[0::2] = range_innovation[valid]
+    innovation[1::2] = bearing_innovation[valid]
+    
+    # Kalman gain from a Cholesky solve: K = P H^T S^-1 = (S^-1 H P)^T since S and P are symmetric
+    HP = H @ P
+    R_stacked = np.kron(np.eye(count), R)
+    S = HP @ H.T + R_stacked
+    try:
+        K = cho_solve(cho_factor(S, lower=True, check_finite=False), HP, check_finite=False).T
+    except np.linalg.LinAlgError:
+        # Skip update if S is not positive definite
+        return x, P
+    
+    # Update state and covariance
+    x = x + K @ innovation
+    x[2] = wrap_angle(x[2])  # Normalize angle
+    
+    # Joseph form keeps P symmetric positive semidefinite without an eigenvalue repair.
+    # (I - KH) P is formed as P - K (HP), reusing HP, so no identity or I - KH is built
+    P_simple = P - K @ HP
+    P = P_simple - (P_simple @ H.T) @ K.T + K @ R_stacked @ K.T
+    
+    # Cheap floor on the variances only
+    P[np.diag_indices(3)] = np.maximum(np.diag(P), 1e-9)
+    
+    return x, P
 
 class WheelOdometryDemo:
-    def __init__(self, fig=None):
+    def __init__(self, fig=None, seed=None):
         """Initialize the wheel odometry demonstration"""
         if fig is None:
             self.fig = plt.figure(figsize=(16, 12))
         else:
             self.fig = fig
             
+        # Random generator for all sensor noise
+        self.rng = np.random.default_rng(seed)
+            
         # Configurable parameters
         self.total_time = 50.0  # Total simulation time (configurable)
         self.landmark_count = 5  # Number of landmarks (configurable)
+        self.max_landmark_count = 13  # Upper bound of the landmark count slider
         
         # Setup plots
         self.setup_plots()
@@ -32,10 +134,15 @@ class WheelOdometryDemo:
         # Initialize EKF
         self.initialize_ekf()
         
-        # Animation control
+        # Animation control: a canvas timer steps the simulation on the GUI thread, one step per dt
         self.is_animating = False
-        self.animation_thread = None
-        self.plot_update_callback = None  # Callback for GUI plot updates
+        self.animation_timer = self.fig.canvas.new_timer(interval=int(self.dt * 1000))
+        self.animation_timer.add_callback(self.animate)
+        
+        # Slider changes that need a full reset are applied once the slider has been still for 150 ms
+        self.reset_timer = self.fig.canvas.new_timer(interval=150)
+        self.reset_timer.single_shot = True
+        self.reset_timer.add_callback(self.flush_reset)
         
     def setup_plots(self):
         """Setup the subplots for wheel odometry demonstration"""
@@ -81,9 +188,20 @@ class WheelOdometryDemo:
         self.ax6 = self.fig.add_subplot(2, 3, 6)
         self.ax6.axis('off')
         self.ax6.set_title('Configuration', fontsize=12, fontweight='bold')
+        self.ax6.set_xlim(0, 1)
+        self.ax6.set_ylim(0, 1)
+        self.config_text = self.ax6.text(0.05, 0.95, '', transform=self.ax6.transAxes,
+                                         fontsize=9, verticalalignment='top', fontfamily='monospace',
+                                         animated=True)
+        self.config_update_interval = 5  # Steps between configuration text refreshes
         
         # plt.tight_layout()  # Removed to avoid compatibility warning
         
+        # Blitting: the simulation artists are animated and drawn over a cached background
+        self._background = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        self.fig.canvas.mpl_connect('resize_event', self._on_resize)
+        
     def setup_simulation(self):
         """Initialize simulation parameters and state"""
         # Simulation parameters
@@ -102,6 +220,7 @@ class WheelOdometryDemo:
         
         # Generate landmarks based on configurable count
         self.landmarks = self.generate_landmarks()
+        self.update_noise_stds()
         
         # Simulation state
         self.is_playing = False
@@ -116,6 +235,7 @@ class WheelOdometryDemo:
         self.setup_trajectory_plot()
         self.setup_error_plot()
         self.setup_sensor_plots()
+        self.clear_error_plot()
         self.update_configuration_display()
         
     def generate_landmarks(self):
@@ -153,116 +273,133 @@ class WheelOdometryDemo:
     
     def initialize_trajectories(self):
         """Initialize true and estimated trajectories"""
+        # Trajectories are stored as separate x, y and theta arrays, one entry per time step
+        n = len(self.times)
+        
         # True trajectory (rectangle)
-        self.true_trajectory = self.generate_rectangle_trajectory()
+        self.true_x, self.true_y, self.true_theta = self.generate_rectangle_trajectory()
+        
+        # True velocities by forward differences; entry k-1 is the motion from step k-1 to step k.
+        # The heading is unwrapped so corners give the physical turn rate, not a -3*pi/2 jump
+        self.true_linear_velocity_profile = np.hypot(np.diff(self.true_x), np.diff(self.true_y)) / self.dt
+        self.true_angular_velocity_profile = np.diff(np.unwrap(self.true_theta)) / self.dt
         
         # Estimated trajectory - start from initial position and evolve with noise
         # Initialize with zeros, will be updated step by step based on noisy measurements
-        self.estimated_trajectory = np.zeros_like(self.true_trajectory)
+        self.estimated_x = np.zeros(n)
+        self.estimated_y = np.zeros(n)
+        self.estimated_theta = np.zeros(n)
         # Set initial position (same as true trajectory starting point)
-        self.estimated_trajectory[0] = self.true_trajectory[0]
+        self.estimated_x[0] = self.true_x[0]
+        self.estimated_y[0] = self.true_y[0]
+        self.estimated_theta[0] = self.true_theta[0]
         
-        # EKF trajectory
-        self.ekf_trajectory = []
+        # EKF trajectory, one EKF estimate per simulated step (sample_count entries)
+        self.ekf_x = np.empty(n)
+        self.ekf_y = np.empty(n)
+        self.ekf_theta = np.empty(n)
         
         # Reset EKF state
         self.initialize_ekf()
         
+        # Per-step histories, filled in place; only the first sample_count entries are valid
+        self.sample_count = 0
+        
+        # Landmark noise of the latest step, reused when drawing the measurement lines
+        self.landmark_noise = np.zeros(2 * len(self.landmarks))
+        
         # Sensor data
-        self.linear_velocities = []
-        self.angular_velocities = []
-        self.true_linear_velocities = []
-        self.true_angular_velocities = []
+        self.linear_velocities = np.empty(n)
+        self.angular_velocities = np.empty(n)
+        self.true_linear_velocities = np.empty(n)
+        self.true_angular_velocities = np.empty(n)
         
         # Error tracking
-        self.position_errors = []
-        self.orientation_errors = []
-        self.ekf_position_errors = []
-        self.ekf_orientation_errors = []
+        self.position_errors = np.empty(n)
+        self.orientation_errors = np.empty(n)
+        self.ekf_position_errors = np.empty(n)
+        self.ekf_orientation_errors = np.empty(n)
         
-    def generate_rectangle_trajectory(self):
-        """Generate a rectangular trajectory"""
-        trajectory = []
-        x, y, theta = 0, 0, 0  # Start at origin
+        # Running extrema of the histories, for the axis limits
+        self.max_position_error = 0.0
+        self.max_orientation_error = 0.0
+        self.min_linear_velocity = self.min_angular_velocity = math.inf
+        self.max_linear_velocity = self.max_angular_velocity = -math.inf
         
+    def generate_rectangle_trajectory(self):
+        """Generate a rectangular trajectory, returned as (x, y, theta) arrays"""
         # Rectangle parameters
         width, height = 10, 8
         velocity = 0.5  # m/s
         
         # Calculate time for each segment
-        segment_times = [width/velocity, height/velocity, width/velocity, height/velocity]
-        total_segment_time = sum(segment_times)
-        
-        # Generate trajectory points
-        for t in self.times:
-            # Determine which segment we're in
-            segment_time = t % total_segment_time
-            cumulative_time = 0
-            
-            for i, seg_time in enumerate(segment_times):
-                if segment_time < cumulative_time + seg_time:
-                    # Calculate position in this segment
-                    local_time = segment_time - cumulative_time
-                    progress = local_time / seg_time
-                    
-                    if i == 0:  # Bottom edge (left to right)
-                        x = progress * width
-                        y = 0
-                        theta = 0
-                    elif i == 1:  # Right edge (bottom to top)
-                        x = width
-                        y = progress * height
-                        theta = np.pi/2
-                    elif i == 2:  # Top edge (right to left)
-                        x = width - progress * width
-                        y = height
-                        theta = np.pi
-                    else:  # Left edge (top to bottom)
-                        x = 0
-                        y = height - progress * height
-                        theta = -np.pi/2
-                    
-                    break
-                cumulative_time += seg_time
-            
-            trajectory.append([x, y, theta])
-        
-        return np.array(trajectory)
+        segment_times = np.array([width/velocity, height/velocity, width/velocity, height/velocity])
+        segment_ends = np.cumsum(segment_times)
+        segment_starts = segment_ends - segment_times
+        
+        # Determine which segment each time step is in, and how far along it
+        segment_time = self.times % segment_ends[-1]
+        segment = np.searchsorted(segment_ends, segment_time, side='right')
+        progress = (segment_time - segment_starts[segment]) / segment_times[segment]
+        
+        # Bottom edge (left to right), right edge (bottom to top),
+        # top edge (right to left), left edge (top to bottom)
+        x = np.choose(segment, [progress * width, np.full_like(progress, width),
+                                width - progress * width, np.zeros_like(progress)])
+        y = np.choose(segment, [np.zeros_like(progress), progress * height,
+                                np.full_like(progress, height), height - progress * height])
+        theta = np.array([0, np.pi/2, np.pi, -np.pi/2])[segment]
+        
+        return x, y, theta
     
-    def add_sensor_noise(self, true_linear_vel, true_angular_vel):
+    def update_noise_stds(self):
+        """Update the per-channel noise stds: linear, angular, then L ranges and L bearings"""
+        count = len(self.landmarks)
+        self._noise_stds = np.concatenate((
+            [self.linear_noise_std, self.angular_noise_std],
+            np.full(count, self.landmark_noise_std),
+            np.full(count, self.landmark_angle_noise_std)))
+    
+    def draw_noise(self):
+        """Draw all noise for one step in a single call, laid out like _noise_stds"""
+        return self.rng.standard_normal(len(self._noise_stds)) * self._noise_stds
+    
+    def add_sensor_noise(self, true_linear_vel, true_angular_vel, noise):
         """Add noise to sensor measurements"""
-        noisy_linear_vel = true_linear_vel + np.random.normal(0, self.linear_noise_std)
-        noisy_angular_vel = true_angular_vel + np.random.normal(0, self.angular_noise_std)
+        noisy_linear_vel = true_linear_vel + noise[0]
+        noisy_angular_vel = true_angular_vel + noise[1]
         
         return noisy_linear_vel, noisy_angular_vel
     
-    def calculate_landmark_measurements(self, robot_pos):
-        """Calculate landmark ranging and bearing measurements"""
-        measurements = []
-        
-        for landmark in self.landmarks:
-            # Calculate true range and bearing
-            dx = landmark[0] - robot_pos[0]
-            dy = landmark[1] - robot_pos[1]
-            true_range = np.sqrt(dx**2 + dy**2)
-            true_bearing = np.arctan2(dy, dx) - robot_pos[2]
-            
-            # Add noise
-            noisy_range = true_range + np.random.normal(0, self.landmark_noise_std)
-            noisy_bearing = true_bearing + np.random.normal(0, self.landmark_angle_noise_std)
-            
-            measurements.append([noisy_range, noisy_bearing])
+    def calculate_landmark_measurements(self, robot_pos, noise):
+        """Calculate landmark ranging and bearing measurements, one (range, bearing) row per landmark
+        
+        noise holds the L range noises followed by the L bearing noises.
+        """
+        count = len(self.landmarks)
+        # Calculate true range and bearing to all landmarks at once
+        dx = self.landmarks[:, 0] - robot_pos[0]
+        dy = self.landmarks[:, 1] - robot_pos[1]
+        measurements = np.empty((count, 2))
+        measurements[:, 0] = np.hypot(dx, dy)
+        measurements[:, 1] = np.arctan2(dy, dx) - robot_pos[2]
+        
+        # Add noise
+        measurements[:, 0] += noise[:count]
+        measurements[:, 1] += noise[count:]
         
         return measurements
     
     def update_odometry(self, linear_vel, angular_vel, dt):
         """Update odometry using wheel encoder measurements"""
         # Simple differential drive model
-        x, y, theta = self.estimated_trajectory[self.current_step - 1]  # Use previous step
+        # Use previous step
+        prev = self.current_step - 1
+        x, y, theta = self.estimated_x[prev], self.estimated_y[prev], self.estimated_theta[prev]
         
         # Update position
-        new_x = x + linear_vel * dt * np.cos(theta)
-        new_y = y + linear_vel * dt * np.sin(theta)
+        new_x = x + linear_vel * dt * math.cos(theta)
+        new_y = y + linear_vel * dt * math.sin(theta)
         new_theta = theta + angular_vel * dt
         
         return new_x, new_y, new_theta
@@ -270,168 +407,194 @@ class WheelOdometryDemo:
     def setup_trajectory_plot(self):
         """Setup the main trajectory plot"""
         # True trajectory
-        self.true_traj_line, = self.ax1.plot([], [], 'b-', linewidth=2, label='True Trajectory')
+        self.true_traj_line, = self.ax1.plot([], [], 'b-', linewidth=2, label='True Trajectory',
+                                             animated=True)
         
         # Estimated trajectory (simple odometry)
-        self.estimated_traj_line, = self.ax1.plot([], [], 'r-', linewidth=2, label='Simple Odometry')
+        self.estimated_traj_line, = self.ax1.plot([], [], 'r-', linewidth=2, label='Simple Odometry',
+                                                  animated=True)
         
         # EKF trajectory
-        self.ekf_traj_line, = self.ax1.plot([], [], 'g-', linewidth=2, label='EKF Estimate')
+        self.ekf_traj_line, = self.ax1.plot([], [], 'g-', linewidth=2, label='EKF Estimate',
+                                            animated=True)
         
         # Robot position
-        self.robot_pos_plot = self.ax1.plot([], [], 'ko', markersize=8, label='Robot Position')[0]
+        self.robot_pos_plot = self.ax1.plot([], [], 'ko', markersize=8, label='Robot Position',
+                                            animated=True)[0]
         
-        # Landmarks (will be updated dynamically)
-        self.landmark_plots = []
-        self.measurement_lines = []
+        # Landmarks, one scatter artist for all of them (offsets updated on reset)
+        self.landmark_scatter = self.ax1.scatter(self.landmarks[:, 0], self.landmarks[:, 1], marker='^',
+                                                 c='g', s=100, label='Landmarks')
+        
+        # Measurement lines for the largest landmark count; lines past the current count stay hidden
+        self.measurement_lines = [
+            self.ax1.plot([], [], 'g--', alpha=0.5, linewidth=1, animated=True)[0]
+            for _ in range(self.max_landmark_count)
+        ]
         
         # Update landmark plots
         self.update_landmark_plots()
         
-        self.ax1.legend()
+        self.ax1.legend().set_animated(True)
         
     def update_landmark_plots(self):
         """Update landmark plots based on current landmark count"""
-        # Clear existing landmark plots
-        if hasattr(self, 'landmark_plots'):
-            for plot in self.landmark_plots:
-                plot.remove()
-        if hasattr(self, 'measurement_lines'):
-            for line in self.measurement_lines:
-                line.remove()
-        
-        self.landmark_plots = []
-        self.measurement_lines = []
-        
-        # Create new landmark plots
-        for i, landmark in enumerate(self.landmarks):
-            plot = self.ax1.plot(landmark[0], landmark[1], 'g^', markersize=10, 
-                               label=f'Landmark {i+1}' if i == 0 else "")[0]
-            self.landmark_plots.append(plot)
-        
-        # Create measurement lines
-        for _ in range(len(self.landmarks)):
-            line, = self.ax1.plot([], [], 'g--', alpha=0.5, linewidth=1)
-            self.measurement_lines.append(line)
+        # Move the landmark markers
+        self.landmark_scatter.set_offsets(self.landmarks)
+        
+        # Show one measurement line per landmark
+        for i, line in enumerate(self.measurement_lines):
+            line.set_visible(i < len(self.landmarks))
         
     def setup_error_plot(self):
         """Setup the error analysis plots with separate subplots for position and angle errors"""
         # Position error lines
-        self.pos_error_line, = self.ax2.plot([], [], 'b-', linewidth=2, label='Simple Odometry')
-        self.ekf_pos_error_line, = self.ax2.plot([], [], 'g-', linewidth=2, label='EKF')
-        self.ax2.legend()
+        self.pos_error_line, = self.ax2.plot([], [], 'b-', linewidth=2, label='Simple Odometry',
+                                             animated=True)
+        self.ekf_pos_error_line, = self.ax2.plot([], [], 'g-', linewidth=2, label='EKF', animated=True)
+        self.ax2.legend().set_animated(True)
         
         # Angle error lines (in degrees)
-        self.angle_error_line, = self.ax3.plot([], [], 'r--', linewidth=2, label='Simple Odometry')
-        self.ekf_angle_error_line, = self.ax3.plot([], [], 'm--', linewidth=2, label='EKF')
-        self.ax3.legend()
+        self.angle_error_line, = self.ax3.plot([], [], 'r--', linewidth=2, label='Simple Odometry',
+                                               animated=True)
+        self.ekf_angle_error_line, = self.ax3.plot([], [], 'm--', linewidth=2, label='EKF', animated=True)
+        self.ax3.legend().set_animated(True)
         
     def setup_sensor_plots(self):
         """Setup the sensor data plots"""
         # Linear velocity
-        self.true_linear_line, = self.ax4.plot([], [], 'b-', linewidth=2, label='True')
-        self.measured_linear_line, = self.ax4.plot([], [], 'r-', linewidth=2, label='Measured')
-        self.ax4.legend()
+        self.true_linear_line, = self.ax4.plot([], [], 'b-', linewidth=2, label='True', animated=True)
+        self.measured_linear_line, = self.ax4.plot([], [], 'r-', linewidth=2, label='Measured', animated=True)
+        self.ax4.legend().set_animated(True)
         
         # Angular velocity
-        self.true_angular_line, = self.ax5.plot([], [], 'b-', linewidth=2, label='True')
-        self.measured_angular_line, = self.ax5.plot([], [], 'r-', linewidth=2, label='Measured')
-        self.ax5.legend()
+        self.true_angular_line, = self.ax5.plot([], [], 'b-', linewidth=2, label='True', animated=True)
+        self.measured_angular_line, = self.ax5.plot([], [], 'r-', linewidth=2, label='Measured', animated=True)
+        self.ax5.legend().set_animated(True)
         
     def update_plots(self):
         """Update all plots with current simulation state"""
         # Update trajectory plot
-        self.true_traj_line.set_data(self.true_trajectory[:self.current_step+1, 0], 
-                                    self.true_trajectory[:self.current_step+1, 1])
-        self.estimated_traj_line.set_data(self.estimated_trajectory[:self.current_step+1, 0], 
-                                        self.estimated_trajectory[:self.current_step+1, 1])
+        k = self.current_step + 1
+        self.true_traj_line.set_data(self.true_x[:k], self.true_y[:k])
+        self.estimated_traj_line.set_data(self.estimated_x[:k], self.estimated_y[:k])
         
         # Update EKF trajectory
-        if len(self.ekf_trajectory) > 0:
-            ekf_traj = np.array(self.ekf_trajectory)
-            self.ekf_traj_line.set_data(ekf_traj[:, 0], ekf_traj[:, 1])
+        n = self.sample_count
+        if n > 0:
+            self.ekf_traj_line.set_data(self.ekf_x[:n], self.ekf_y[:n])
         
         # Update robot position
-        if self.current_step < len(self.true_trajectory):
-            true_pos = self.true_trajectory[self.current_step]
+        if self.current_step < len(self.times):
+            step = self.current_step
             
             # Use EKF state for robot position if available, otherwise use true position
-            if len(self.ekf_trajectory) > 0:
-                est_pos = self.ekf_trajectory[-1]
+            if n > 0:
+                est_pos = (self.ekf_x[n-1], self.ekf_y[n-1], self.ekf_theta[n-1])
             else:
-                est_pos = self.estimated_trajectory[self.current_step]
+                est_pos = (self.estimated_x[step], self.estimated_y[step], self.estimated_theta[step])
             
-            self.robot_pos_plot.set_data([true_pos[0]], [true_pos[1]])
+            self.robot_pos_plot.set_data([self.true_x[step]], [self.true_y[step]])
             
             # Update landmark measurements using EKF state
-            if self.use_landmarks and len(self.ekf_trajectory) > 0:
-                measurements = self.calculate_landmark_measurements(est_pos)
-                for i, (range_meas, bearing_meas) in enumerate(measurements):
-                    landmark = self.landmarks[i]
-                    # Draw line from robot to landmark (showing the range measurement)
-                    # The bearing is relative to robot's orientation
-                    robot_to_landmark_angle = est_pos[2] + bearing_meas
-                    end_x = est_pos[0] + range_meas * np.cos(robot_to_landmark_angle)
-                    end_y = est_pos[1] + range_meas * np.sin(robot_to_landmark_angle)
-                    self.measurement_lines[i].set_data([est_pos[0], end_x], [est_pos[1], end_y])
+            if self.use_landmarks and n > 0:
+                # Reuse the step's landmark noise so redraws never consume the simulation's RNG
+                measurements = self.calculate_landmark_measurements(est_pos, self.landmark_noise)
+                # Draw lines from robot to landmarks (showing the range measurements)
+                # The bearing is relative to robot's orientation
+                angles = est_pos[2] + measurements[:, 1]
+                ends_x = est_pos[0] + measurements[:, 0] * np.cos(angles)
+                ends_y = est_pos[1] + measurements[:, 0] * np.sin(angles)
+                for line, end_x, end_y in zip(self.measurement_lines, ends_x, ends_y):
+                    line.set_data([est_pos[0], end_x], [est_pos[1], end_y])
             else:
                 for line in self.measurement_lines:
                     line.set_data([], [])
         
+        # Every history holds one sample per simulated step
+        if n == 0:
+            return
+        times = self.times[:n]
+        
         # Update error plot
-        if len(self.position_errors) > 0:
-            self.pos_error_line.set_data(self.times[:len(self.position_errors)], self.position_errors)
-            
-        if len(self.ekf_position_errors) > 0:
-            self.ekf_pos_error_line.set_data(self.times[:len(self.ekf_position_errors)], self.ekf_position_errors)
-            
-        if len(self.orientation_errors) > 0:
-            self.angle_error_line.set_data(self.times[:len(self.orientation_errors)], self.orientation_errors)
-            
-        if len(self.ekf_orientation_errors) > 0:
-            self.ekf_angle_error_line.set_data(self.times[:len(self.ekf_orientation_errors)], self.ekf_orientation_errors)
-        
-        # Update error plot axis limits
-        if len(self.position_errors) > 0 or len(self.ekf_position_errors) > 0:
-            max_pos_error = max(max(self.position_errors) if self.position_errors else 0,
-                              max(self.ekf_position_errors) if self.ekf_position_errors else 0)
-            self.ax2.set_xlim(0, self.times[min(len(self.position_errors), len(self.times)-1)])
-            self.ax2.set_ylim(0, max_pos_error * 1.1)
-            
-        if len(self.orientation_errors) > 0 or len(self.ekf_orientation_errors) > 0:
-            max_angle_error = max(max(self.orientation_errors) if self.orientation_errors else 0,
-                                max(self.ekf_orientation_errors) if self.ekf_orientation_errors else 0)
-            self.ax3.set_xlim(0, self.times[min(len(self.orientation_errors), len(self.times)-1)])
-            self.ax3.set_ylim(0, max_angle_error * 1.1)
+        self.pos_error_line.set_data(times, self.position_errors[:n])
+        self.ekf_pos_error_line.set_data(times, self.ekf_position_errors[:n])
+        self.angle_error_line.set_data(times, self.orientation_errors[:n])
+        self.ekf_angle_error_line.set_data(times, self.ekf_orientation_errors[:n])
         
-        # Update sensor plots
-        if len(self.linear_velocities) > 0:
-            self.true_linear_line.set_data(self.times[:len(self.true_linear_velocities)], self.true_linear_velocities)
-            self.measured_linear_line.set_data(self.times[:len(self.linear_velocities)], self.linear_velocities)
+        # Update error plot axis limits (the time axes span the whole run)
+        self.update_ylim(self.ax2, 0, self.max_position_error * 1.1, keep_bottom=True)
+        self.update_ylim(self.ax3, 0, self.max_orientation_error * 1.1, keep_bottom=True)
         
-        if len(self.angular_velocities) > 0:
-            self.true_angular_line.set_data(self.times[:len(self.true_angular_velocities)], self.true_angular_velocities)
-            self.measured_angular_line.set_data(self.times[:len(self.angular_velocities)], self.angular_velocities)
+        # Update sensor plots
+        self.true_linear_line.set_data(times, self.true_linear_velocities[:n])
+        self.measured_linear_line.set_data(times, self.linear_velocities[:n])
+        self.true_angular_line.set_data(times, self.true_angular_velocities[:n])
+        self.measured_angular_line.set_data(times, self.angular_velocities[:n])
         
         # Update axis limits for sensor plots
-        if len(self.linear_velocities) > 0:
-            self.ax4.set_xlim(0, self.times[min(len(self.linear_velocities), len(self.times)-1)])
-            self.ax4.set_ylim(min(self.linear_velocities + self.true_linear_velocities) - 0.1,
-                             max(self.linear_velocities + self.true_linear_velocities) + 0.1)
+        self.update_ylim(self.ax4, self.min_linear_velocity - 0.1, self.max_linear_velocity + 0.1)
+        self.update_ylim(self.ax5, self.min_angular_velocity - 0.1, self.max_angular_velocity + 0.1)
         
-        if len(self.angular_velocities) > 0:
-            self.ax5.set_xlim(0, self.times[min(len(self.angular_velocities), len(self.times)-1)])
-            self.ax5.set_ylim(min(self.angular_velocities + self.true_angular_velocities) - 0.1,
-                             max(self.angular_velocities + self.true_angular_velocities) + 0.1)
+    def update_ylim(self, ax, bottom, top, keep_bottom=False):
+        """Fit the y limits of ax to [bottom, top] with some headroom
+        
+        Every change invalidates the blit background and forces a full redraw, so the limits only
+        move when the data outgrow them or shrink well inside them.
+        """
+        span = top - bottom
+        if span <= 0:
+            return
+        low, high = ax.get_ylim()
+        if low <= bottom and top <= high and high - low <= 2 * span:
+            return
+        headroom = 0.125 * span
+        ax.set_ylim(bottom if keep_bottom else bottom - headroom, top + headroom)
+        self._background = None
+            
+    def _on_draw(self, event):
+        """Capture the static background and draw the animated artists on top"""
+        if self.fig.canvas.is_saving():
+            return
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+        
+    def _on_resize(self, event):
+        """Forget the cached background, it no longer matches the canvas size"""
+        self._background = None
+        
+    def _draw_animated(self):
+        """Draw all animated artists with the current renderer"""
+        for line in (self.true_traj_line, self.estimated_traj_line, self.ekf_traj_line, self.robot_pos_plot):
+            self.ax1.draw_artist(line)
+        for line in self.measurement_lines:
+            self.ax1.draw_artist(line)
+        self.ax2.draw_artist(self.pos_error_line)
+        self.ax2.draw_artist(self.ekf_pos_error_line)
+        self.ax3.draw_artist(self.angle_error_line)
+        self.ax3.draw_artist(self.ekf_angle_error_line)
+        self.ax4.draw_artist(self.true_linear_line)
+        self.ax4.draw_artist(self.measured_linear_line)
+        self.ax5.draw_artist(self.true_angular_line)
+        self.ax5.draw_artist(self.measured_angular_line)
+        self.ax6.draw_artist(self.config_text)
+        # Legends sit above the lines, so they are redrawn on top of them
+        for ax in (self.ax1, self.ax2, self.ax3, self.ax4, self.ax5):
+            ax.draw_artist(ax.get_legend())
+        
+    def blit(self):
+        """Redraw only the animated artists on top of the cached background"""
+        canvas = self.fig.canvas
+        if self._background is None:
+            # No background yet, or the axes limits or landmarks changed since it was cached
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        self._draw_animated()
+        canvas.blit(self.fig.bbox)
         
     def update_configuration_display(self):
         """Update the configuration display text"""
-        # Clear previous text
-        self.ax6.clear()
-        self.ax6.set_xlim(0, 1)
-        self.ax6.set_ylim(0, 1)
-        self.ax6.axis('off')
-        
         config_text = "Configuration:\n"
         config_text += f"  Total Time: {self.total_time:.1f}s\n"
         config_text += f"  Landmark Count: {self.landmark_count}\n"
@@ -449,19 +612,15 @@ class WheelOdometryDemo:
         config_text += f"  Enabled: {'Yes' if self.use_landmarks else 'No'}\n"
         config_text += f"  Update Freq: {self.landmark_update_freq} steps\n\n"
         
-        if len(self.position_errors) > 0:
+        if self.sample_count > 0:
+            last = self.sample_count - 1
             config_text += f"Current Error:\n"
-            config_text += f"  Simple Odometry: {self.position_errors[-1]:.3f} m\n"
-            if len(self.orientation_errors) > 0:
-                config_text += f"  Orientation: {self.orientation_errors[-1]:.1f}°\n"
-            
-            if len(self.ekf_position_errors) > 0:
-                config_text += f"  EKF: {self.ekf_position_errors[-1]:.3f} m\n"
-                if len(self.ekf_orientation_errors) > 0:
-                    config_text += f"  EKF Orientation: {self.ekf_orientation_errors[-1]:.1f}°"
+            config_text += f"  Simple Odometry: {self.position_errors[last]:.3f} m\n"
+            config_text += f"  Orientation: {self.orientation_errors[last]:.1f}°\n"
+            config_text += f"  EKF: {self.ekf_position_errors[last]:.3f} m\n"
+            config_text += f"  EKF Orientation: {self.ekf_orientation_errors[last]:.1f}°"
         
-        self.ax6.text(0.05, 0.95, config_text, transform=self.ax6.transAxes, 
-                     fontsize=9, verticalalignment='top', fontfamily='monospace')
+        self.config_text.set_text(config_text)
         
     def setup_controls(self):
         """Setup interactive controls"""
@@ -483,8 +642,13 @@ class WheelOdometryDemo:
         self.step_button = Button(ax_step, 'Step', color='lightblue')
         self.step_button.on_clicked(self.step_simulation)
         
+        # Run to end button
+        ax_run_to_end = plt.axes([0.4, 0.15, 0.08, 0.03])
+        self.run_to_end_button = Button(ax_run_to_end, 'Run to End', color='lightblue')
+        self.run_to_end_button.on_clicked(self.run_to_end)
+        
         # Landmarks toggle
-        ax_landmarks = plt.axes([0.4, 0.15, 0.12, 0.03])
+        ax_landmarks = plt.axes([0.5, 0.15, 0.12, 0.03])
         self.landmarks_checkbox = CheckButtons(ax_landmarks, ['Use Landmarks'], [self.use_landmarks])
         self.landmarks_checkbox.on_clicked(self.toggle_landmarks)
         
@@ -499,7 +663,7 @@ class WheelOdometryDemo:
         # Landmark count slider
         ax_landmark_count = plt.axes([0.1, 0.07, 0.6, 0.02])
         self.landmark_count_slider = Slider(
-            ax_landmark_count, 'Landmark Count', 1, 13, valinit=self.landmark_count,
+            ax_landmark_count, 'Landmark Count', 1, self.max_landmark_count, valinit=self.landmark_count,
             valstep=1, color='green'
         )
         self.landmark_count_slider.on_changed(self.on_landmark_count_change)
@@ -514,19 +678,20 @@ class WheelOdometryDemo:
         
     def toggle_play(self, event):
         """Toggle play/pause"""
-        self.is_animating = not self.is_animating
-        if self.is_animating:
+        if not self.is_animating:
             self.play_button.label.set_text('Pause')
             self.play_button.color = 'lightyellow'
             self.start_simulation()
         else:
+            self.stop_simulation()
             self.play_button.label.set_text('Play')
             self.play_button.color = 'lightgreen'
+        self.fig.canvas.draw_idle()
             
     def reset_simulation(self, event=None):
         """Reset simulation to initial state"""
         self.current_step = 0
-        self.is_animating = False
+        self.stop_simulation()
         
         # Only update button if event was provided (manual reset)
         if event is not None:
@@ -535,6 +700,7 @@ class WheelOdometryDemo:
         
         # Regenerate landmarks and trajectories with current parameters
         self.landmarks = self.generate_landmarks()
+        self.update_noise_stds()
         self.times = np.arange(0, self.total_time, self.dt)
         self.initialize_trajectories()
         
@@ -543,28 +709,43 @@ class WheelOdometryDemo:
         
         # Update landmark plots
         self.update_landmark_plots()
+        self._background = None
         
         # Update plots
         self.update_plots()
         self.update_configuration_display()
         
     def clear_error_plot(self):
-        """Clear all error plot lines"""
-        self.pos_error_line.set_data([], [])
-        self.ekf_pos_error_line.set_data([], [])
-        self.angle_error_line.set_data([], [])
-        self.ekf_angle_error_line.set_data([], [])
-        
-        # Reset axis limits
-        self.ax2.set_xlim(0, self.total_time)
+        """Clear all error and sensor plot lines"""
+        for line in (self.pos_error_line, self.ekf_pos_error_line, self.angle_error_line,
+                     self.ekf_angle_error_line, self.true_linear_line, self.measured_linear_line,
+                     self.true_angular_line, self.measured_angular_line):
+            line.set_data([], [])
+        
+        # Reset axis limits; the time axes stay fixed for the whole run
+        for ax in (self.ax2, self.ax3, self.ax4, self.ax5):
+            ax.set_xlim(0, self.total_time)
         self.ax2.set_ylim(0, 1)
-        self.ax3.set_xlim(0, self.total_time)
         self.ax3.set_ylim(0, 1)
         
     def step_simulation(self, event=None):
         """Step simulation by one time step"""
         if self.current_step < len(self.times) - 1:
             self.run_single_step()
+            # Redraw here only for the button; GUI callers schedule their own redraw
+            if event is not None:
+                self.blit()
+            
+    def run_to_end(self, event=None):
+        """Stop any running animation and compute the rest of the simulation at once"""
+        self.stop_simulation()
+        self.run_all_steps()
+        
+        # Redraw here only for the button; GUI callers schedule their own redraw
+        if event is not None:
+            self.play_button.label.set_text('Play')
+            self.play_button.color = 'lightgreen'
+            self.fig.canvas.draw_idle()
             
     def toggle_landmarks(self, use_landmarks):
         """Toggle landmark usage"""
@@ -573,6 +754,7 @@ class WheelOdometryDemo:
     def on_linear_noise_change(self, val):
         """Handle linear noise slider change"""
         self.linear_noise_std = val
+        self.update_noise_stds()
         # Update measurement noise covariance
         self.update_measurement_noise()
         
@@ -580,40 +762,76 @@ class WheelOdometryDemo:
         """Handle total time slider change"""
         self.total_time = val
         # Auto-reset to apply new configuration
-        self.reset_simulation(None)
+        self.schedule_reset()
         
     def on_landmark_count_change(self, val):
         """Handle landmark count slider change"""
         self.landmark_count = val
         # Auto-reset to apply new configuration
+        self.schedule_reset()
+        
+    def schedule_reset(self):
+        """Restart the reset timer, so a slider drag resets the simulation only once it settles"""
+        self.reset_timer.stop()
+        self.reset_timer.start()
+        
+    def flush_reset(self):
+        """Apply the latest slider configuration and redraw"""
         self.reset_simulation(None)
+        self.fig.canvas.draw_idle()
         
-    def run_single_step(self):
-        """Run a single simulation step"""
+    def run_single_step(self, throttle_config=False):
+        """Run a single simulation step and redraw
+        
+        With throttle_config the text panel is only refreshed every few steps and at the end,
+        which is enough while the animation timer is running.
+        """
         if self.current_step >= len(self.times) - 1:
             return
         
+        self.advance_step()
+        
+        # Update plots
+        self.update_plots()
+        if (not throttle_config or self.current_step % self.config_update_interval == 0
+                or self.current_step >= len(self.times) - 1):
+            self.update_configuration_display()
+        
+    def run_all_steps(self):
+        """Run the rest of the simulation without intermediate redraws, then redraw once"""
+        last_step = len(self.times) - 1
+        while self.current_step < last_step:
+            self.advance_step()
+        
+        self.update_plots()
+        self.update_configuration_display()
+        
+    def advance_step(self):
+        """Advance the simulation state by one time step without touching the plots"""
         # Get true velocities from trajectory
         if self.current_step > 0:
-            true_pos = self.true_trajectory[self.current_step]
-            prev_pos = self.true_trajectory[self.current_step - 1]
+            step = self.current_step
+            true_pos = (self.true_x[step], self.true_y[step], self.true_theta[step])
             
-            # Calculate true velocities
-            dx = true_pos[0] - prev_pos[0]
-            dy = true_pos[1] - prev_pos[1]
-            dtheta = true_pos[2] - prev_pos[2]
+            # True velocities, precomputed for the whole trajectory
+            true_linear_vel = self.true_linear_velocity_profile[step - 1]
+            true_angular_vel = self.true_angular_velocity_profile[step - 1]
             
-            true_linear_vel = np.sqrt(dx**2 + dy**2) / self.dt
-            true_angular_vel = dtheta / self.dt
-            
-            # Add noise to measurements
-            measured_linear_vel, measured_angular_vel = self.add_sensor_noise(true_linear_vel, true_angular_vel)
+            # Add noise to measurements, drawing this step's noise for every channel at once
+            noise = self.draw_noise()
+            self.landmark_noise = noise[2:]
+            measured_linear_vel, measured_angular_vel = self.add_sensor_noise(true_linear_vel, true_angular_vel, noise)
             
             # Store velocities
-            self.true_linear_velocities.append(true_linear_vel)
-            self.true_angular_velocities.append(true_angular_vel)
-            self.linear_velocities.append(measured_linear_vel)
-            self.angular_velocities.append(measured_angular_vel)
+            n = self.sample_count
+            self.true_linear_velocities[n] = true_linear_vel
+            self.true_angular_velocities[n] = true_angular_vel
+            self.linear_velocities[n] = measured_linear_vel
+            self.angular_velocities[n] = measured_angular_vel
+            self.min_linear_velocity = min(self.min_linear_velocity, true_linear_vel, measured_linear_vel)
+            self.max_linear_velocity = max(self.max_linear_velocity, true_linear_vel, measured_linear_vel)
+            self.min_angular_velocity = min(self.min_angular_velocity, true_angular_vel, measured_angular_vel)
+            self.max_angular_velocity = max(self.max_angular_velocity, true_angular_vel, measured_angular_vel)
             
             # EKF Prediction step
             self.ekf_predict(measured_linear_vel, measured_angular_vel, self.dt)
@@ -621,68 +839,75 @@ class WheelOdometryDemo:
             # EKF Update step with landmark measurements
             if self.use_landmarks:
                 # Use true position for landmark measurements (not EKF estimate to avoid feedback)
-                true_pos = self.true_trajectory[self.current_step]
-                measurements = self.calculate_landmark_measurements(true_pos)
+                measurements = self.calculate_landmark_measurements(true_pos, self.landmark_noise)
                 self.ekf_update(measurements)
             
             # Store EKF estimate
-            self.ekf_trajectory.append(self.x.copy())
+            self.ekf_x[n], self.ekf_y[n], self.ekf_theta[n] = self.x
             
             # Update estimated trajectory (simple odometry for comparison)
-            est_pos = self.estimated_trajectory[self.current_step - 1]
             new_x, new_y, new_theta = self.update_odometry(measured_linear_vel, measured_angular_vel, self.dt)
-            self.estimated_trajectory[self.current_step] = [new_x, new_y, new_theta]
+            self.estimated_x[step] = new_x
+            self.estimated_y[step] = new_y
+            self.estimated_theta[step] = new_theta
             
             # Calculate errors
-            true_pos = self.true_trajectory[self.current_step]
-            
             # Simple odometry errors
-            position_error = np.sqrt((true_pos[0] - new_x)**2 + (true_pos[1] - new_y)**2)
+            position_error = math.hypot(true_pos[0] - new_x, true_pos[1] - new_y)
             orientation_error = true_pos[2] - new_theta
-            # Wrap angle error to [-pi, pi] range
-            orientation_error = np.arctan2(np.sin(orientation_error), np.cos(orientation_error))
+            # Wrap angle error to [-pi, pi) range
+            orientation_error = wrap_angle(orientation_error)
             # Convert angle error to degrees
-            orientation_error_deg = np.degrees(abs(orientation_error))
-            self.position_errors.append(position_error)
-            self.orientation_errors.append(orientation_error_deg)
+            orientation_error_deg = math.degrees(abs(orientation_error))
+            self.position_errors[n] = position_error
+            self.orientation_errors[n] = orientation_error_deg
             
             # EKF errors
-            ekf_position_error = np.sqrt((true_pos[0] - self.x[0])**2 + (true_pos[1] - self.x[1])**2)
+            ekf_position_error = math.hypot(true_pos[0] - self.x[0], true_pos[1] - self.x[1])
             ekf_orientation_error = true_pos[2] - self.x[2]
-            # Wrap angle error to [-pi, pi] range
-            ekf_orientation_error = np.arctan2(np.sin(ekf_orientation_error), np.cos(ekf_orientation_error))
+            # Wrap angle error to [-pi, pi) range
+            ekf_orientation_error = wrap_angle(ekf_orientation_error)
             # Convert angle error to degrees
-            ekf_orientation_error_deg = np.degrees(abs(ekf_orientation_error))
-            self.ekf_position_errors.append(ekf_position_error)
-            self.ekf_orientation_errors.append(ekf_orientation_error_deg)
+            ekf_orientation_error_deg = math.degrees(abs(ekf_orientation_error))
+            self.ekf_position_errors[n] = ekf_position_error
+            self.ekf_orientation_errors[n] = ekf_orientation_error_deg
+            self.max_position_error = max(self.max_position_error, position_error, ekf_position_error)
+            self.max_orientation_error = max(self.max_orientation_error,
+                                             orientation_error_deg, ekf_orientation_error_deg)
+            self.sample_count += 1
         
         self.current_step += 1
         
-        # Update plots
-        self.update_plots()
-        self.update_configuration_display()
-        
     # GUI Integration Methods
     def start_simulation(self):
         """Start the simulation"""
         if not self.is_animating:
             self.is_animating = True
-            self.animation_thread = threading.Thread(target=self.animation_loop)
-            self.animation_thread.daemon = True
-            self.animation_thread.start()
+            self.animation_timer.start()
             
     def stop_simulation(self):
         """Stop the simulation"""
+        if self.is_animating:
+            # The animation refreshes the text panel only every few steps, catch it up on pause
+            self.update_configuration_display()
         self.is_animating = False
+        self.animation_timer.stop()
         
-    def animation_loop(self):
-        """Animation loop for continuous simulation"""
-        while self.is_animating and self.current_step < len(self.times) - 1:
-            self.run_single_step()
+    def animate(self):
+        """Advance the simulation by one step and blit the moving artists"""
+        if not self.is_animating:
+            return
             
-            # Trigger GUI plot update if callback is set
-            if self.plot_update_callback:
-                self.plot_update_callback()
+        if self.current_step >= len(self.times) - 1:
+            # End of the run: stop the timer and restore the Play button
+            self.stop_simulation()
+            self.play_button.label.set_text('Play')
+            self.play_button.color = 'lightgreen'
+            self.fig.canvas.draw_idle()
+            return
+            
+        self.run_single_step(throttle_config=True)
+        self.blit()
             
     def initialize_ekf(self):
         """Initialize Extended Kalman Filter with appropriate parameters"""
@@ -693,15 +918,29 @@ class WheelOdometryDemo:
         # This allows the EKF to converge more quickly from initial errors
         self.P = np.diag([0.1, 0.1, 0.01])  # Initial uncertainty
         
-        # Process noise covariance (3x3) - should match sensor noise characteristics
-        # Scale with sensor noise parameters for realistic performance
-        self.Q = np.diag([self.linear_noise_std**2, self.linear_noise_std**2, self.angular_noise_std**2])
+        # Process noise covariance (3x3, diagonal, kept as its diagonal) - should match sensor noise
+        # characteristics. Scale with sensor noise parameters for realistic performance
+        self.Q_diag = np.empty(3)
+        self.Q_scaled_diag = np.empty(3)
+        self.update_process_noise()
         
         # Measurement noise covariance will be updated dynamically
         self.update_measurement_noise()
         
-        # EKF state history for plotting
-        self.ekf_trajectory = []
+        # Normalized innovation below which a landmark measurement is skipped (0 applies all of them);
+        # skipping saves update work but discards information, so it is off by default
+        self.innovation_gate = 0.0
+        
+        # Scratch matrices for the prediction step, reused every step
+        self._F = np.eye(3)
+        self._FP = np.empty((3, 3))
+        
+    def update_process_noise(self):
+        """Update process noise variances and their per-step scaled copy in place from the sensor noise parameters"""
+        self.Q_diag[:] = (self.linear_noise_std**2, self.linear_noise_std**2, self.angular_noise_std**2)
+        # Process noise - scale with time step and sensor noise
+        # Use more conservative scaling for better stability
+        np.multiply(self.Q_diag, self.dt * 0.5, out=self.Q_scaled_diag)  # Reduced scaling factor for stability
         
     def update_measurement_noise(self):
         """Update measurement noise covariance based on current noise parameters"""
@@ -711,91 +950,24 @@ class WheelOdometryDemo:
         
     def ekf_predict(self, linear_vel, angular_vel, dt):
         """EKF prediction step (motion update) with appropriate noise handling"""
-        # Current state
-        x, y, theta = self.x
-        
-        # Predict new state
-        new_x = x + linear_vel * dt * np.cos(theta)
-        new_y = y + linear_vel * dt * np.sin(theta)
-        new_theta = theta + angular_vel * dt
-        
-        # Normalize angle
-        new_theta = np.arctan2(np.sin(new_theta), np.cos(new_theta))
-        
-        # State transition matrix (Jacobian of motion model)
-        F = np.array([
-            [1, 0, -linear_vel * dt * np.sin(theta)],
-            [0, 1,  linear_vel * dt * np.cos(theta)],
-            [0, 0,  1]
-        ])
-        
-        # Process noise - scale with time step and sensor noise
-        # Use more conservative scaling for better stability
-        Q_scaled = self.Q * dt * 0.5  # Reduced scaling factor for stability
+        # The scaled process noise is cached for the simulation time step
+        Q_scaled_diag = self.Q_scaled_diag if dt == self.dt else self.Q_diag * dt * 0.5
         
-        # Update state and covariance
-        self.x = np.array([new_x, new_y, new_theta])
-        self.P = F @ self.P @ F.T + Q_scaled
+        self.x, self.P = ekf_predict_core(self.x, self.P, linear_vel, angular_vel, dt, Q_scaled_diag,
+                                          self._F, self._FP)
         
     def ekf_update(self, landmark_measurements):
-        """EKF update step (measurement update) with appropriate noise handling"""
-        if not landmark_measurements:
+        """EKF update step (measurement update) with appropriate noise handling
+        
+        landmark_measurements is an (L, 2) float array of (range, bearing) rows, as returned
+        by calculate_landmark_measurements; other sequences are converted once here.
+        """
+        landmark_measurements = np.asarray(landmark_measurements, dtype=float).reshape(-1, 2)
+        if len(landmark_measurements) == 0:
             return
             
-        for i, (range_meas, bearing_meas) in enumerate(landmark_measurements):
-            if i >= len(self.landmarks):
-                break
-                
-            landmark = self.landmarks[i]
-            x, y, theta = self.x
-            
-            # Predicted measurement
-            dx = landmark[0] - x
-            dy = landmark[1] - y
-            predicted_range = np.sqrt(dx**2 + dy**2)
-            predicted_bearing = np.arctan2(dy, dx) - theta
-            
-            # Normalize bearing
-            predicted_bearing = np.arctan2(np.sin(predicted_bearing), np.cos(predicted_bearing))
-            
-            # Measurement Jacobian
-            if predicted_range > 0.1:  # Avoid singularity
-                H = np.array([
-                    [-dx/predicted_range, -dy/predicted_range, 0],
-                    [dy/predicted_range**2, -dx/predicted_range**2, -1]
-                ])
-                
-                # Kalman gain
-                S = H @ self.P @ H.T + self.R
-                
-                # Check for numerical stability
-                if np.linalg.cond(S) < 1e12:  # Standard condition number check
-                    try:
-                        K = self.P @ H.T @ np.linalg.inv(S)
-                        
-                        # Innovation
-                        innovation = np.array([range_meas - predicted_range, 
-                                             bearing_meas - predicted_bearing])
-                        
-                        # Normalize bearing innovation
-                        innovation[1] = np.arctan2(np.sin(innovation[1]), np.cos(innovation[1]))
-                        
-                        # Update state and covariance
-                        self.x = self.x + K @ innovation
-                        self.x[2] = np.arctan2(np.sin(self.x[2]), np.cos(self.x[2]))  # Normalize angle
-                        
-                        I = np.eye(3)
-                        self.P = (I - K @ H) @ self.P
-                        
-                        # Ensure covariance remains positive definite
-                        self.P = (self.P + self.P.T) / 2  # Make symmetric
-                        min_eig = np.min(np.real(np.linalg.eigvals(self.P)))
-                        if min_eig < 1e-6:
-                            self.P += (1e-6 - min_eig) * np.eye(3)
-                            
-                    except np.linalg.LinAlgError:
-                        # Skip update if matrix is singular
-                        continue
+        self.x, self.P = ekf_update_core(self.x, self.P, self.landmarks, landmark_measurements, self.R,
+                                         self.innovation_gate)
         
     def update_parameters(self, total_time, linear_noise):
         """Update simulation parameters"""
@@ -803,7 +975,7 @@ class WheelOdometryDemo:
         self.linear_noise_std = linear_noise
         
         # Update EKF parameters
-        self.Q = np.diag([self.linear_noise_std**2, self.linear_noise_std**2, self.angular_noise_std**2])
+        self.update_process_noise()
         
         # Reset simulation to apply new parameters
         self.reset_simulation()
@@ -812,10 +984,6 @@ class WheelOdometryDemo:
         """Run the demonstration"""
         plt.show()
 
-    def set_plot_update_callback(self, callback):
-        """Set callback function for GUI plot updates"""
-        self.plot_update_callback = callback
-
 def main():
     """Main function to run the wheel odometry demonstration"""
     print("Wheel Odometry Demonstration")